@@ -0,0 +1,60 @@
+"""Rows/sec for vectorised cohort BMI and hydration analytics.
+
+Run from the repository root:
+    python -m benchmarks.cohort_bench --rows 5000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from cohort_analytics import CohortAnalyzer, analyse_file
+
+
+def synthetic_chunks(rows, chunk_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        yield {
+            "weight_kg": rng.normal(72, 15, n).clip(30, 250),
+            "height_cm": rng.normal(165, 10, n).clip(120, 210),
+            "water_intake_ml": rng.normal(2000, 600, n).clip(0, 6000),
+            "water_goal_ml": np.full(n, 2500.0),
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=5_000_000)
+    ap.add_argument("--chunk-rows", type=int, default=250_000)
+    ap.add_argument("--csv-rows", type=int, default=500_000, help="rows for the CSV end-to-end run (0 to skip)")
+    args = ap.parse_args()
+
+    chunks = list(synthetic_chunks(args.rows, args.chunk_rows))
+    analyzer = CohortAnalyzer()
+    start = time.perf_counter()
+    for chunk in chunks:
+        analyzer.add_chunk(chunk)
+    elapsed = time.perf_counter() - start
+    print(f"in-memory columns: {args.rows:,} rows in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/s)")
+
+    if args.csv_rows:
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write("weight_kg,height_cm,water_intake_ml,water_goal_ml\n")
+            for chunk in synthetic_chunks(args.csv_rows, args.chunk_rows):
+                np.savetxt(f, np.column_stack([chunk[c] for c in ("weight_kg", "height_cm", "water_intake_ml", "water_goal_ml")]),
+                           delimiter=",", fmt="%.1f")
+        try:
+            start = time.perf_counter()
+            analyse_file(path, args.chunk_rows)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.remove(path)
+        print(f"CSV end-to-end:    {args.csv_rows:,} rows in {elapsed:.2f}s ({args.csv_rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
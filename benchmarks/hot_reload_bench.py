@@ -0,0 +1,78 @@
+"""Query latency while the knowledge base is hot-reloaded.
+
+Run from the repository root:
+    python -m benchmarks.hot_reload_bench --seconds 5 --reload-every 0.25
+"""
+import argparse
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+
+from medical_engine import MedicalEngine
+
+QUERIES = ["I have a headache", "fever kya hai", "सिरदर्द से राहत", "fatigue and blood loss",
+           "migraine since morning", "Hemoglobin 11.2 g/dL", "hello", "how do I sleep better"]
+
+
+def percentiles(samples):
+    if not samples:
+        return (0.0, 0.0, 0.0)
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)], samples[-1]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--reload-every", type=float, default=0.25)
+    ap.add_argument("--window-ms", type=float, default=5.0, help="how close to a swap counts as 'during'")
+    args = ap.parse_args()
+
+    engine = MedicalEngine()
+    path = os.path.join(tempfile.mkdtemp(), "content.json")
+    swaps = []
+    stop = threading.Event()
+
+    def reloader():
+        n = 0
+        while not stop.wait(args.reload_every):
+            n += 1
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"knowledge_base": {"migraine": {
+                    "explanation": f"A migraine is a recurring, often one-sided headache (rev {n}).",
+                    "consult_doctor_if": ["It is the worst headache of your life."]}}}, f)
+            engine.reload_content(path)
+            swaps.append(time.perf_counter())
+
+    timings = []
+    thread = threading.Thread(target=reloader)
+    thread.start()
+    end = time.perf_counter() + args.seconds
+    i = 0
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        engine.process_query(QUERIES[i % len(QUERIES)])
+        timings.append((start, (time.perf_counter() - start) * 1e6))
+        i += 1
+    stop.set()
+    thread.join()
+    os.remove(path)
+
+    window = args.window_ms / 1000
+    during, steady = [], []
+    for start, us in timings:
+        k = bisect.bisect_left(swaps, start - window)
+        (during if k < len(swaps) and swaps[k] <= start + window else steady).append(us)
+
+    print(f"{len(timings)} queries, {len(swaps)} swaps, final version {engine.content_version}")
+    print(f"{'':14}{'count':>8}{'p50':>10}{'p99':>10}{'max':>10}  (µs)")
+    for name, samples in (("steady", steady), ("near a swap", during)):
+        p50, p99, worst = percentiles(samples)
+        print(f"{name:14}{len(samples):8}{p50:10.1f}{p99:10.1f}{worst:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
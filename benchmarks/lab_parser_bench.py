@@ -0,0 +1,85 @@
+"""Throughput benchmark for the streaming lab report parser.
+
+Run from the repository root:
+    python -m benchmarks.lab_parser_bench --size-mb 64
+
+First checks that streaming gives exactly the readings parse() finds in
+the whole text, across chunk sizes and for one long unbroken line, and
+exits non-zero if not.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+from lab_parser import LabReportParser
+
+SAMPLE_LINES = [
+    "Hemoglobin 11.2 g/dL, Platelets 1.2 lakh/cumm, WBC 12,400",
+    "Patient: R. Sharma | Age 54 | Hb: 13.9 gm/dl | TLC 7,800 /cumm",
+    "Fasting Blood Sugar (FBS): 126 mg/dL; Platelet count 2,35,000 /mcL",
+    "Glucose 5.6 mmol/L  Haemoglobin 128 g/L  PLT 310 x10^3/uL",
+    "Remarks: sample received in good condition, no clots observed.",
+]
+
+
+def write_sample(path, size_mb):
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            block = "\n".join(random.choice(SAMPLE_LINES) for _ in range(1000)) + "\n"
+            f.write(block)
+            written += len(block.encode("utf-8"))
+    return written
+
+
+def check_streaming(parser, lines=2000, chunk_sizes=(12, 100, 4096, 65536)):
+    rng = random.Random(0)
+    texts = {
+        "multi-line": "\n".join(rng.choice(SAMPLE_LINES) for _ in range(lines)) + "\n",
+        "single line": " ".join(rng.choice(SAMPLE_LINES) for _ in range(lines)),
+    }
+    # No safe separator anywhere: exercises the long-line fallback
+    texts["no separators"] = texts["single line"].replace("|", ",").replace(";", ",")
+    failures = []
+    for name, text in texts.items():
+        expected = parser.parse(text)
+        for chunk_size in chunk_sizes:
+            streamed = list(LabReportParser(parser.lab_markers, chunk_size).parse_stream(io.StringIO(text)))
+            if streamed != expected:
+                failures.append(f"{name}, chunk {chunk_size}: {len(streamed)} readings, expected {len(expected)}")
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size-mb", type=int, default=32)
+    ap.add_argument("--chunk-kb", type=int, default=1024)
+    args = ap.parse_args()
+
+    parser = LabReportParser(chunk_size=args.chunk_kb * 1024)
+    failures = check_streaming(parser)
+    if failures:
+        print("Streaming differs from parse():\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        size = write_sample(path, args.size_mb)
+        start = time.perf_counter()
+        count = sum(1 for _ in parser.parse_file(path))
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+
+    print(f"Parsed {size / 1e6:.1f} MB -> {count} readings in {elapsed:.2f}s "
+          f"({size / 1e6 / elapsed:.1f} MB/s, chunk {args.chunk_kb} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Correctness corpus and timing for the shared query normalisation stage.
+
+Run from the repository root:
+    python -m benchmarks.normalizer_bench --iterations 20000
+
+Exits non-zero if any corpus entry (tokens, language, branch, topics)
+no longer matches, so it doubles as a regression check.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from medical_engine import MedicalEngine
+from query_normalizer import normalize
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "query_corpus.json")
+
+
+def check_corpus(engine, corpus):
+    failures = []
+    for case in corpus:
+        response = engine.answer(case["query"])
+        got = {"tokens": list(normalize(case["query"]).tokens), "lang": response.lang,
+               "branch": response.kind, "topics": list(response.topics)}
+        for field, value in got.items():
+            if case[field] != value:
+                failures.append(f"{case['query']!r}: {field} expected {case[field]!r}, got {value!r}")
+    return failures
+
+
+def time_per_call(fn, queries, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(queries[i % len(queries)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--iterations", type=int, default=20000)
+    args = ap.parse_args()
+
+    with open(CORPUS, encoding="utf-8") as f:
+        corpus = json.load(f)
+    engine = MedicalEngine()
+
+    failures = check_corpus(engine, corpus)
+    print(f"corpus: {len(corpus) - len({f.split(':')[0] for f in failures})}/{len(corpus)} queries match")
+    for failure in failures:
+        print("  " + failure)
+
+    queries = [case["query"] for case in corpus]
+    unique = [f"{q} {i}" for i, q in enumerate(queries * (args.iterations // len(queries) + 1))][:args.iterations]
+    cold = time_per_call(normalize.__wrapped__, unique, args.iterations)
+    warm = time_per_call(normalize, queries, args.iterations)
+    route = time_per_call(engine.process_query, queries, args.iterations)
+    print(f"normalize (uncached): {cold:.2f} µs/query")
+    print(f"normalize (memoised): {warm:.2f} µs/query")
+    print(f"process_query:        {route:.2f} µs/query")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
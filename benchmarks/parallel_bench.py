@@ -0,0 +1,47 @@
+"""Throughput scaling of QueryExecutor from 1 to N workers.
+
+Run from the repository root:
+    python -m benchmarks.parallel_bench --queries 50000 --modes thread process
+"""
+import argparse
+import os
+import time
+
+from parallel import QueryExecutor, gil_disabled
+
+QUERIES = ["I have a headache", "fever kya hai", "सिरदर्द से राहत", "fatigue and blood loss",
+           "Hemoglobin 11.2 g/dL, WBC 12,400", "hello", "how do I sleep better", "chest pain"]
+
+
+def run(mode, workers, queries, fmt):
+    with QueryExecutor(mode, workers) as pool:
+        list(pool.map(queries[:workers * 64], fmt=fmt))  # start workers and warm caches
+        start = time.perf_counter()
+        count = sum(1 for _ in pool.map(queries, fmt=fmt))
+        return count / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--queries", type=int, default=50000)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--modes", nargs="+", default=["thread", "process"] + (["free-threaded"] if gil_disabled() else []))
+    ap.add_argument("--format", default="markdown")
+    args = ap.parse_args()
+
+    # Unique suffixes defeat the response cache so every query does real matching work
+    queries = [f"{QUERIES[i % len(QUERIES)]} #{i}" for i in range(args.queries)]
+    counts = sorted({1, 2, 4, 8, 16, 32, args.max_workers} & set(range(1, args.max_workers + 1)))
+
+    print(f"{os.cpu_count()} CPUs, GIL {'disabled' if gil_disabled() else 'enabled'}")
+    print(f"{'mode':15}{'workers':>8}{'queries/s':>12}{'speedup':>9}")
+    for mode in args.modes:
+        base = None
+        for n in counts:
+            qps = run(mode, n, queries, args.format)
+            base = base or qps
+            print(f"{mode:15}{n:8}{qps:12,.0f}{qps / base:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per-query latency added by the slow-query profiler, disabled and enabled.
+
+Run from the repository root:
+    python -m benchmarks.profiler_bench --queries 20000 --sample-rate 0.01
+"""
+import argparse
+import tempfile
+
+from benchmarks.query_log_bench import measure
+from medical_engine import MedicalEngine
+from query_profiler import build_report
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--queries", type=int, default=20000)
+    ap.add_argument("--sample-rate", type=float, default=0.01)
+    ap.add_argument("--report", action="store_true", help="print the aggregated report afterwards")
+    args = ap.parse_args()
+
+    engine = MedicalEngine()
+    measure(engine, 1000)  # warm up
+    off = measure(engine, args.queries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = engine.enable_profiling(tmp, sample_rate=0.0)
+        idle = measure(engine, args.queries)
+        engine.disable_profiling()
+
+        profiler = engine.enable_profiling(tmp, sample_rate=args.sample_rate)
+        on = measure(engine, args.queries)
+        engine.disable_profiling()
+        report = build_report(tmp, top=15) if args.report else None
+
+    print(f"{'':22}{'mean':>10}{'p50':>10}{'p99':>10}  (µs/query)")
+    print(f"{'profiler off':22}{off[0]:10.1f}{off[1]:10.1f}{off[2]:10.1f}")
+    print(f"{'enabled, no samples':22}{idle[0]:10.1f}{idle[1]:10.1f}{idle[2]:10.1f}")
+    print(f"{f'sampling {args.sample_rate:.1%}':22}{on[0]:10.1f}{on[1]:10.1f}{on[2]:10.1f}")
+    print(f"captured {profiler.captured}, skipped {profiler.skipped}")
+    if report:
+        print()
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
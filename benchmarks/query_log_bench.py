@@ -0,0 +1,55 @@
+"""Per-query latency added by the structured query log.
+
+Run from the repository root:
+    python -m benchmarks.query_log_bench --queries 20000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from medical_engine import MedicalEngine
+
+QUERIES = [
+    "I have a headache", "mujhe bukhar hai kya karu", "सिरदर्द से राहत",
+    "Hemoglobin 11.2 g/dL, WBC 12,400", "fatigue and blood loss", "how do I sleep better",
+    "hello", "chest pain since morning",
+]
+
+
+def measure(engine, n):
+    samples = []
+    for i in range(n):
+        q = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        engine.process_query(q)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.mean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--queries", type=int, default=20000)
+    args = ap.parse_args()
+
+    engine = MedicalEngine()
+    measure(engine, 1000)  # warm up
+    off = measure(engine, args.queries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = engine.enable_query_log(os.path.join(tmp, "queries.jsonl"), max_bytes=1024 * 1024)
+        on = measure(engine, args.queries)
+        engine.disable_query_log()
+        stats = logger.stats()
+
+    print(f"{'':12}{'mean':>10}{'p50':>10}{'p99':>10}  (µs/query)")
+    print(f"{'log off':12}{off[0]:10.1f}{off[1]:10.1f}{off[2]:10.1f}")
+    print(f"{'log on':12}{on[0]:10.1f}{on[1]:10.1f}{on[2]:10.1f}")
+    print(f"added mean {on[0] - off[0]:+.1f} µs, p99 {on[2] - off[2]:+.1f} µs; "
+          f"written {stats['written']}, dropped {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
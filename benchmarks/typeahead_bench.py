@@ -0,0 +1,79 @@
+"""Per-keystroke typeahead latency as the knowledge base grows.
+
+Run from the repository root:
+    python -m benchmarks.typeahead_bench --sizes 10 1000 10000 30000
+
+Each size pads the built-in topics with synthetic ones (each with a
+Hinglish and a Hindi alias), then "types" a set of inputs one character at
+a time and times every lookup. Exits non-zero if p99 reaches 1 ms.
+"""
+import argparse
+import random
+import sys
+import time
+
+from medical_engine import MedicalEngine
+from typeahead import build_index
+
+TYPED = [
+    "headache", "mujhe bukhar hai", "सिरदर्द", "pet dard", "blood sugar", "hb", "platelets",
+    "khoon ki kami", "high bp", "stomach pain", "fever and cough", "प्लेटलेट्स",
+]
+
+_LATIN = ["ka", "ra", "mo", "ti", "su", "ne", "pa", "lo", "vi", "de", "sha", "gu", "ba", "ri", "to", "ma"]
+_DEVANAGARI = ["क", "र", "मो", "ति", "सु", "ने", "प", "लो", "वि", "दे", "शा", "गु", "ब", "री", "तो", "मा"]
+
+
+def synthetic_content(engine, size, seed=0):
+    rng = random.Random(seed)
+    knowledge_base = dict(engine.knowledge_base)
+    while len(knowledge_base) < size:
+        n = rng.randint(2, 4)
+        name = " ".join("".join(rng.choice(_LATIN) for _ in range(n)) for _ in range(rng.randint(1, 2)))
+        knowledge_base[name] = {"aliases": {
+            "hinglish": ["".join(rng.choice(_LATIN) for _ in range(n + 1)) + " dard"],
+            "hi": ["".join(rng.choice(_DEVANAGARI) for _ in range(n))],
+        }}
+    popularity = {topic: rng.randint(0, 100) for topic in knowledge_base}
+    return knowledge_base, popularity
+
+
+def keystroke_latencies(index, repeat):
+    samples = []
+    for _ in range(repeat):
+        for text in TYPED:
+            for i in range(1, len(text) + 1):
+                start = time.perf_counter()
+                index.suggest(text[:i])
+                samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 30000])
+    ap.add_argument("--repeat", type=int, default=50)
+    args = ap.parse_args()
+
+    engine = MedicalEngine()
+    print(f"{'topics':>8}{'names':>9}{'build s':>10}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}")
+    worst_p99 = 0.0
+    for size in args.sizes:
+        knowledge_base, popularity = synthetic_content(engine, size)
+        start = time.perf_counter()
+        index = build_index(knowledge_base, engine.lab_markers, popularity)
+        build = time.perf_counter() - start
+        samples = keystroke_latencies(index, args.repeat)
+        p99 = samples[int(len(samples) * 0.99)]
+        worst_p99 = max(worst_p99, p99)
+        print(f"{len(knowledge_base):8}{index.size:9}{build:10.2f}{samples[len(samples) // 2]:10.1f}"
+              f"{p99:10.1f}{samples[-1]:10.1f}")
+
+    if worst_p99 >= 1000:
+        print(f"FAIL: p99 keystroke latency {worst_p99:.0f} µs is over 1 ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Throughput and memory of the unmatched-query miner.
+
+Run from the repository root:
+    python -m benchmarks.unmatched_miner_bench --queries 200000
+"""
+import argparse
+import random
+import time
+
+from unmatched_miner import UnmatchedMiner
+
+WORDS = ["migraine", "back", "pain", "rash", "itching", "acidity", "gas", "kamar", "dard", "thyroid",
+         "pcos", "vitamin", "deficiency", "insomnia", "anxiety", "knee", "joint", "allergy", "jukam", "cold"]
+
+
+def random_queries(n, seed=7):
+    rng = random.Random(seed)
+    for _ in range(n):
+        # Zipf-like skew so a few topics dominate, like real traffic
+        k = rng.randint(2, 5)
+        yield " ".join(WORDS[min(int(rng.paretovariate(1.2)) - 1, len(WORDS) - 1)] for _ in range(k))
+        if rng.random() < 0.01:
+            yield f"rare symptom {rng.randint(0, 10**9)}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--queries", type=int, default=200000)
+    ap.add_argument("--width", type=int, default=1 << 16)
+    args = ap.parse_args()
+
+    miner = UnmatchedMiner(top=20, width=args.width)
+    start = time.perf_counter()
+    miner.feed_lines(random_queries(args.queries))
+    elapsed = time.perf_counter() - start
+
+    # Sketch size is fixed up front; only the top-k tables grow, and they are capped at k
+    sketch_bytes = sum(len(row) * row.itemsize for s in miner.sketches.values() for row in s.rows)
+    print(f"{miner.seen} queries in {elapsed:.2f}s ({miner.seen / elapsed:,.0f} q/s), "
+          f"sketch memory {sketch_bytes / 1e6:.1f} MB across {len(miner.sketches)} language(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Population BMI and hydration analytics for clinic cohorts.
+
+Processes columnar data in fixed-size chunks with NumPy so millions of rows
+never need to be held in memory at once. Categories come from
+health_metrics, the same thresholds the BMI Calculator uses.
+
+    python cohort_analytics.py cohort.csv
+    python cohort_analytics.py cohort.parquet --chunk-rows 500000
+
+Expected columns: weight_kg, height_cm and optionally water_intake_ml and
+water_goal_ml (the goal defaults to the app's daily goal).
+"""
+# Standard imports
+import argparse
+import os
+from itertools import islice
+
+import numpy as np
+
+from health_metrics import BMI_CATEGORIES, BMI_THRESHOLDS, DEFAULT_WATER_GOAL_ML, hydration_percent
+
+COLUMNS = ("weight_kg", "height_cm", "water_intake_ml", "water_goal_ml")
+
+# Histogram used for streaming percentiles: 0.1 BMI-unit / 1% hydration resolution
+_BMI_BINS = np.linspace(0, 100, 1001)
+_HYDRATION_BINS = np.linspace(0, 300, 301)
+
+
+def compute_metrics(weight_kg, height_cm, water_intake_ml=None, water_goal_ml=None):
+    """Vectorised per-row BMI, category index and hydration percentage."""
+    weight_kg = np.asarray(weight_kg, dtype=np.float64)
+    height_m = np.asarray(height_cm, dtype=np.float64) / 100
+    bmi = weight_kg / (height_m * height_m)
+    category = np.digitize(bmi, BMI_THRESHOLDS)
+
+    hydration = None
+    if water_intake_ml is not None:
+        goal = DEFAULT_WATER_GOAL_ML if water_goal_ml is None else np.asarray(water_goal_ml, dtype=np.float64)
+        hydration = hydration_percent(np.asarray(water_intake_ml, dtype=np.float64), goal)
+    return bmi, category, hydration
+
+
+class _RunningStats:
+    """Count/mean/std/min/max plus a fixed histogram, updated chunk by chunk."""
+
+    def __init__(self, bins):
+        self.bins = bins
+        self.hist = np.zeros(len(bins) - 1, dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        if values.size == 0:
+            return
+        self.n += values.size
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.hist += np.histogram(np.clip(values, self.bins[0], self.bins[-1]), self.bins)[0]
+
+    def percentile(self, q):
+        if self.n == 0:
+            return float("nan")
+        idx = int(np.searchsorted(np.cumsum(self.hist), q / 100 * self.n))
+        upper = float(self.bins[min(idx + 1, len(self.bins) - 1)])
+        return min(max(upper, self.min), self.max)
+
+    def summary(self):
+        if self.n == 0:
+            return {"count": 0}
+        mean = self.total / self.n
+        return {
+            "count": self.n,
+            "mean": round(mean, 2),
+            "std": round(max(self.total_sq / self.n - mean * mean, 0.0) ** 0.5, 2),
+            "min": round(self.min, 2),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "max": round(self.max, 2),
+        }
+
+
+class CohortAnalyzer:
+    """Accumulates cohort statistics over any number of column chunks."""
+
+    def __init__(self):
+        self.rows = 0
+        self.invalid_rows = 0
+        self.category_counts = np.zeros(len(BMI_CATEGORIES), dtype=np.int64)
+        self.bmi = _RunningStats(_BMI_BINS)
+        self.hydration = _RunningStats(_HYDRATION_BINS)
+        self.goal_met = 0
+
+    def add_chunk(self, columns):
+        """Add one chunk given as a mapping of column name -> 1-D array."""
+        weight = np.asarray(columns["weight_kg"], dtype=np.float64)
+        height = np.asarray(columns["height_cm"], dtype=np.float64)
+        intake = columns.get("water_intake_ml")
+        goal = columns.get("water_goal_ml")
+
+        # Drop rows that can't produce a meaningful BMI (missing, zero or negative)
+        valid = np.isfinite(weight) & np.isfinite(height) & (weight > 0) & (height > 0)
+        self.rows += weight.size
+        self.invalid_rows += int(weight.size - valid.sum())
+
+        if intake is not None:
+            intake = np.asarray(intake, dtype=np.float64)[valid]
+        if goal is not None:
+            goal = np.asarray(goal, dtype=np.float64)[valid]
+        bmi, category, hydration = compute_metrics(weight[valid], height[valid], intake, goal)
+
+        self.bmi.update(bmi)
+        self.category_counts += np.bincount(category, minlength=len(BMI_CATEGORIES))
+        if hydration is not None:
+            hydration = hydration[np.isfinite(hydration)]
+            self.hydration.update(hydration)
+            self.goal_met += int((hydration >= 100).sum())
+
+    def summary(self):
+        valid = self.rows - self.invalid_rows
+        categories = {}
+        for cat, count in zip(BMI_CATEGORIES, self.category_counts.tolist()):
+            categories[cat["key"]] = {"label": cat["label"], "count": count,
+                                      "percent": round(count / valid * 100, 2) if valid else 0.0}
+        result = {"rows": self.rows, "invalid_rows": self.invalid_rows, "bmi": self.bmi.summary(),
+                  "bmi_categories": categories}
+        if self.hydration.n:
+            result["hydration_percent"] = self.hydration.summary()
+            result["water_goal_met"] = {"count": self.goal_met,
+                                        "percent": round(self.goal_met / self.hydration.n * 100, 2)}
+        return result
+
+
+def iter_csv_chunks(path, chunk_rows=250000):
+    """Yield column chunks from a CSV file with a header row."""
+    with open(path, encoding="utf-8") as f:
+        header = [h.strip() for h in f.readline().split(",")]
+        missing = {"weight_kg", "height_cm"} - set(header)
+        if missing:
+            raise ValueError(f"{path}: missing required columns {sorted(missing)}")
+        wanted = [c for c in COLUMNS if c in header]
+        usecols = [header.index(c) for c in wanted]
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                break
+            try:
+                block = np.loadtxt(lines, delimiter=",", usecols=usecols, ndmin=2)
+            except ValueError:
+                # Blank or malformed cells: parse this chunk cell by cell with NaN for
+                # anything unreadable, so those rows are counted as invalid, not fatal
+                block = _parse_lines_lenient(lines, usecols)
+            yield {c: block[:, i] for i, c in enumerate(wanted)}
+
+
+def _to_float(cell):
+    try:
+        return float(cell)
+    except ValueError:
+        return np.nan
+
+
+def _parse_lines_lenient(lines, usecols):
+    rows = []
+    for line in lines:
+        if not line.strip():
+            continue
+        cells = line.rstrip("\r\n").split(",")
+        rows.append([_to_float(cells[i]) if i < len(cells) else np.nan for i in usecols])
+    return np.array(rows, dtype=np.float64).reshape(-1, len(usecols))
+
+
+def iter_parquet_chunks(path, chunk_rows=250000):
+    """Yield column chunks from a Parquet file (requires the optional pyarrow package)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow") from None
+    parquet = pq.ParquetFile(path)
+    wanted = [c for c in COLUMNS if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=wanted):
+        yield {c: batch.column(c).to_numpy(zero_copy_only=False) for c in wanted}
+
+
+def iter_npz_chunks(path, chunk_rows=250000):
+    """Yield column chunks from a NumPy .npz file of equal-length column arrays."""
+    with np.load(path) as data:
+        wanted = [c for c in COLUMNS if c in data.files]
+        columns = {c: data[c] for c in wanted}
+    n = len(columns["weight_kg"])
+    for start in range(0, n, chunk_rows):
+        yield {c: col[start:start + chunk_rows] for c, col in columns.items()}
+
+
+def analyse_file(path, chunk_rows=250000):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".parquet", ".pq"):
+        chunks = iter_parquet_chunks(path, chunk_rows)
+    elif ext == ".npz":
+        chunks = iter_npz_chunks(path, chunk_rows)
+    else:
+        chunks = iter_csv_chunks(path, chunk_rows)
+
+    analyzer = CohortAnalyzer()
+    for chunk in chunks:
+        analyzer.add_chunk(chunk)
+    return analyzer.summary()
+
+
+def format_report(summary):
+    lines = [f"Rows: {summary['rows']:,} ({summary['invalid_rows']:,} skipped as invalid)", "", "BMI"]
+    bmi = summary["bmi"]
+    if bmi["count"]:
+        lines.append(f"  mean {bmi['mean']}  std {bmi['std']}  min {bmi['min']}  "
+                     f"median ~{bmi['p50']}  p90 ~{bmi['p90']}  max {bmi['max']}")
+    for cat in summary["bmi_categories"].values():
+        lines.append(f"  {cat['label']:<16}{cat['count']:>12,}  {cat['percent']:6.2f}%")
+    if "hydration_percent" in summary:
+        h = summary["hydration_percent"]
+        met = summary["water_goal_met"]
+        lines += ["", "Hydration (% of daily water goal)",
+                  f"  mean {h['mean']}%  median ~{h['p50']}%  p90 ~{h['p90']}%",
+                  f"  goal met by {met['count']:,} ({met['percent']}%)"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cohort BMI and hydration analytics.")
+    ap.add_argument("path", help="CSV, Parquet (.parquet) or NumPy (.npz) file")
+    ap.add_argument("--chunk-rows", type=int, default=250000)
+    ap.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = ap.parse_args(argv)
+
+    summary = analyse_file(args.path, args.chunk_rows)
+    if args.json:
+        import json
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
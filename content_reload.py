@@ -0,0 +1,191 @@
+# Standard imports
+import copy
+import json
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+from lab_parser import LabReportParser
+from med_interactions import InteractionChecker
+from query_normalizer import normalize_phrase, phrase_pattern
+from typeahead import build_index
+
+CONTENT_KEYS = ("knowledge_base", "lab_markers", "emergency_keywords", "translations")
+
+
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Inverse of freeze(), for JSON export or editing a copy."""
+    if isinstance(value, MappingProxyType):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class KnowledgeSnapshot:
+    """One immutable version of the engine's content plus the indexes built from it.
+
+    Queries grab the current snapshot once and use it throughout, so a reload
+    that swaps in a new snapshot never changes content under a running query.
+    The response cache lives on the snapshot, so it is dropped with it.
+
+    Content is frozen (read-only mappings and tuples), which makes a snapshot
+    safe to share between threads: the only writes are to the response
+    cache, whose entries are idempotent, and the swap of the typeahead index
+    when the engine re-ranks suggestions.
+    """
+    __slots__ = ("version", "knowledge_base", "lab_markers", "emergency_keywords", "translations",
+                 "lab_parser", "med_checker", "emergency_patterns", "topic_patterns", "typeahead", "response_cache")
+
+    def __init__(self, content, version=0, popularity=None):
+        self.version = version
+        self.knowledge_base = freeze(content["knowledge_base"])
+        self.lab_markers = freeze(content["lab_markers"])
+        self.emergency_keywords = freeze(content["emergency_keywords"])
+        self.translations = freeze(content["translations"])
+        self.lab_parser = LabReportParser(self.lab_markers)
+        self.med_checker = InteractionChecker()
+        # Word-start matchers over normalised query text, in content order
+        self.emergency_patterns = tuple((kw, phrase_pattern(kw, prefix=True)) for kw in self.emergency_keywords)
+        self.topic_patterns = tuple((topic, phrase_pattern(topic)) for topic in self.knowledge_base)
+        self.typeahead = build_index(self.knowledge_base, self.lab_markers, popularity)
+        self.response_cache = {}
+
+
+def merge_content(base, overrides):
+    """Overlay a content file on the built-in content.
+
+    Topics, lab markers and per-language translation keys are added or
+    replaced individually; `emergency_keywords` is replaced as a whole.
+    """
+    merged = copy.deepcopy(base)
+    for key in ("knowledge_base", "lab_markers"):
+        merged[key].update(overrides.get(key, {}))
+    for lang, strings in overrides.get("translations", {}).items():
+        merged["translations"].setdefault(lang, {}).update(strings)
+    if "emergency_keywords" in overrides:
+        # Copied as-is (not list()-ed) so a bare string fails validation instead of splitting
+        merged["emergency_keywords"] = copy.deepcopy(overrides["emergency_keywords"])
+    return merged
+
+
+def _validate_aliases(where, aliases):
+    # Optional typeahead names: {"hi": [...], "hinglish": [...]}
+    if not isinstance(aliases, dict) or not all(
+            isinstance(names, list) and all(isinstance(n, str) for n in names) for names in aliases.values()):
+        raise ValueError(f"{where}['aliases'] must map a language to a list of names")
+
+
+def _is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_content(content):
+    """Raise ValueError if content would break response formatting."""
+    for topic, data in content["knowledge_base"].items():
+        if not normalize_phrase(topic):
+            # Topics are matched by their normalised name; an empty one matches every query
+            raise ValueError(f"knowledge_base key {topic!r} has no letters or digits")
+        for field in ("explanation", "consult_doctor_if"):
+            if field not in data:
+                raise ValueError(f"knowledge_base['{topic}'] is missing '{field}'")
+        for field, value in data.items():
+            if field == "aliases":
+                _validate_aliases(f"knowledge_base['{topic}']", value)
+            elif field == "explanation":
+                if not isinstance(value, str):
+                    raise ValueError(f"knowledge_base['{topic}']['explanation'] must be a string")
+            elif not _is_string_list(value):
+                # Every other field is rendered as a bulleted list
+                raise ValueError(f"knowledge_base['{topic}']['{field}'] must be a list of strings")
+    for marker, ref in content["lab_markers"].items():
+        for field in ("min", "max", "unit", "low", "high"):
+            if field not in ref:
+                raise ValueError(f"lab_markers['{marker}'] is missing '{field}'")
+        if not (_is_number(ref["min"]) and _is_number(ref["max"])) or ref["min"] > ref["max"]:
+            raise ValueError(f"lab_markers['{marker}'] needs numeric 'min' <= 'max'")
+        for field in ("unit", "low", "high"):
+            if not isinstance(ref[field], str):
+                raise ValueError(f"lab_markers['{marker}']['{field}'] must be a string")
+        if "aliases" in ref:
+            _validate_aliases(f"lab_markers['{marker}']", ref["aliases"])
+    if not _is_string_list(content["emergency_keywords"]):
+        raise ValueError("emergency_keywords must be a list of strings")
+    empty = [kw for kw in content["emergency_keywords"] if not normalize_phrase(kw)]
+    if empty:
+        # "!!" would make every reply an emergency
+        raise ValueError(f"emergency_keywords have no letters or digits: {empty}")
+    required = set(content["translations"]["en"])
+    for lang, strings in content["translations"].items():
+        missing = required - set(strings)
+        if missing:
+            raise ValueError(f"translations['{lang}'] is missing {sorted(missing)}")
+        wrong = sorted(key for key, value in strings.items() if not isinstance(value, str))
+        if wrong:
+            raise ValueError(f"translations['{lang}'] values must be strings: {wrong}")
+
+
+def load_content_file(path, base):
+    """Read a JSON content file and return the merged, validated content."""
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    unknown = set(overrides) - set(CONTENT_KEYS)
+    if unknown:
+        raise ValueError(f"unknown content sections: {sorted(unknown)}")
+    content = merge_content(base, overrides)
+    validate_content(content)
+    return content
+
+
+class ContentWatcher:
+    """Polls a content file and hot-swaps the engine snapshot when it changes."""
+
+    def __init__(self, engine, path, interval=2.0):
+        self.engine = engine
+        self.path = path
+        self.interval = interval
+        self.last_error = None
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="content-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                self.engine.reload_content(self.path)
+                self.last_error = None
+            except Exception as e:
+                # Half-written or invalid file: keep serving the current snapshot, and keep
+                # watching so the next edit can fix it
+                self.last_error = e
+                print(f"content_reload: keeping version {self.engine.content_version}: {e}", file=sys.stderr)
@@ -0,0 +1,38 @@
+# Shared health calculations used by the Streamlit tools and cohort analytics,
+# so a single person and a whole cohort are always classified the same way.
+
+# Upper bounds (exclusive) of each BMI category; the last category is open-ended
+BMI_THRESHOLDS = (18.5, 25.0, 30.0)
+
+BMI_CATEGORIES = (
+    {"key": "underweight", "label": "Underweight", "level": "warning",
+     "message": "Status: Underweight. You may need a more nutrient-dense diet."},
+    {"key": "healthy", "label": "Healthy Weight", "level": "success",
+     "message": "Status: Healthy Weight. Keep it up!"},
+    {"key": "overweight", "label": "Overweight", "level": "warning",
+     "message": "Status: Overweight. Consider checking your daily activity levels."},
+    {"key": "obese", "label": "Obese", "level": "error",
+     "message": "Status: Obese. It's recommended to consult a healthcare provider for a plan."},
+)
+
+DEFAULT_WATER_GOAL_ML = 2500
+
+
+def calculate_bmi(weight_kg, height_cm):
+    return weight_kg / ((height_cm / 100) ** 2)
+
+
+def bmi_category_index(bmi):
+    """Index into BMI_CATEGORIES; matches numpy.digitize(bmi, BMI_THRESHOLDS)."""
+    for i, upper in enumerate(BMI_THRESHOLDS):
+        if bmi < upper:
+            return i
+    return len(BMI_THRESHOLDS)
+
+
+def bmi_category(bmi):
+    return BMI_CATEGORIES[bmi_category_index(bmi)]
+
+
+def hydration_percent(intake_ml, goal_ml):
+    return intake_ml / goal_ml * 100
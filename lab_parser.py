@@ -0,0 +1,191 @@
+# Standard imports
+import re
+import io
+from collections import namedtuple
+from functools import lru_cache
+
+# A single extracted lab value, already converted to the unit used in `lab_markers`
+LabReading = namedtuple("LabReading", ["marker", "value", "unit", "status", "note", "raw"])
+
+# Names people (and lab exports) actually use for each marker in `lab_markers`
+MARKER_ALIASES = {
+    "hemoglobin": ["hemoglobin", "haemoglobin", "hgb", "hb"],
+    "glucose": ["blood glucose", "blood sugar", "glucose", "fbs", "rbs", "ppbs"],
+    "wbc": ["total leucocyte count", "total leukocyte count", "white blood cells", "white blood cell count",
+            "wbc count", "wbc", "tlc"],
+    "platelets": ["platelet count", "platelets", "platelet", "plt"]
+}
+
+# Conversion factors from a normalised unit key into the `lab_markers` unit of each marker
+UNIT_FACTORS = {
+    "hemoglobin": {"g/dl": 1.0, "gm/dl": 1.0, "gm%": 1.0, "g%": 1.0, "g/l": 0.1, "mmol/l": 1.611},
+    "glucose": {"mg/dl": 1.0, "mg%": 1.0, "mmol/l": 18.016},
+    "wbc": {"/ul": 1.0, "cells/ul": 1.0, "x10^3/ul": 1000.0, "10^3/ul": 1000.0, "k/ul": 1000.0,
+            "thou/ul": 1000.0, "x10^9/l": 1000.0, "10^9/l": 1000.0},
+    "platelets": {"/ul": 1.0, "cells/ul": 1.0, "x10^3/ul": 1000.0, "10^3/ul": 1000.0, "k/ul": 1000.0,
+                  "thou/ul": 1000.0, "x10^9/l": 1000.0, "10^9/l": 1000.0, "lakh/ul": 100000.0}
+}
+
+# Indian number words that scale the value itself ("1.2 lakh", "12 thousand")
+MULTIPLIERS = {"lakh": 100000.0, "lakhs": 100000.0, "lac": 100000.0, "lacs": 100000.0,
+               "thousand": 1000.0, "k": 1000.0}
+
+_NUMBER = r"\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+# Readings never span a line break, ";" or "|", so chunks split there can't lose one
+_SP = r"[ \t]*"
+_UNIT = (r"(?:x[ \t]*)?10[ \t]*\^?[ \t]*[39][ \t]*/[ \t]*(?:[uµμ]l|mcl|l|cumm|mm3)"
+         r"|(?:lakhs?|lacs?|thou|k|cells)?[ \t]*/[ \t]*(?:[uµμ]l|mcl|cumm|cu\.?[ \t]*mm|mm3)"
+         r"|g(?:m)?[ \t]*/[ \t]*d?l|g(?:m)?[ \t]*%|mg[ \t]*/[ \t]*dl|mg[ \t]*%|mmol[ \t]*/[ \t]*l|mcl")
+
+# A bare number followed by one of these is a duration or count, not a result
+# ("platelets 2 days ago", "my hb 12 months ago")
+_NOT_A_RESULT = re.compile(r"[ \t]*(?:ago|times|x\b|(?:sec(?:ond)?|min(?:ute)?|h(?:ou)?r|day|week|wk|month|year|yr)s?\b)",
+                           re.IGNORECASE)
+# Without a unit, a value this far outside the reference range is not a reading of that marker
+_PLAUSIBLE_FACTOR = 10
+
+# Separators a chunk may safely be split on without cutting a reading in half
+_BOUNDARIES = ("\n", ";", "|")
+# Longer than any reading (barring absurd runs of spaces); on a single huge line,
+# a match followed by this much text can't change when more text arrives
+_MAX_READING = 256
+
+
+@lru_cache(maxsize=512)
+def _normalise_unit(unit):
+    """Collapse spelling variants of a unit into the keys used by UNIT_FACTORS."""
+    unit = unit.lower().replace(" ", "").replace("µ", "u").replace("μ", "u").replace(".", "")
+    unit = re.sub(r"(mcl|cumm|mm3)$", "ul", unit)
+    unit = re.sub(r"^(lakhs|lacs|lac)/", "lakh/", unit)
+    if unit.startswith("10^") or unit.startswith("x10^"):
+        return unit if unit.startswith("x") else "x" + unit
+    if re.match(r"^10[39]/", unit):
+        return "x10^" + unit[2:]
+    if unit == "ul":
+        return "/ul"
+    return unit
+
+
+def _parse_number(text):
+    """Parse both Western (12,400) and Indian (1,50,000) digit grouping."""
+    return float(text.replace(",", ""))
+
+
+class LabReportParser:
+    """Extracts marker/value/unit readings from free-text lab reports."""
+
+    def __init__(self, lab_markers=None, chunk_size=1 << 20):
+        if lab_markers is None:
+            from medical_engine import engine
+            lab_markers = engine.lab_markers
+        self.lab_markers = lab_markers
+        self.chunk_size = chunk_size
+
+        # Every marker answers to its own name, the built-in aliases and any
+        # "aliases" from a content file; longest first so "wbc count" wins over "wbc"
+        self.alias_to_marker = {}
+        for marker, ref in lab_markers.items():
+            names = [marker, *MARKER_ALIASES.get(marker, ())]
+            for lang_names in ref.get("aliases", {}).values():
+                names.extend(lang_names)
+            for alias in names:
+                self.alias_to_marker.setdefault(alias.lower(), marker)
+        alternation = "|".join(re.escape(a) for a in sorted(self.alias_to_marker, key=len, reverse=True))
+
+        self.pattern = re.compile(
+            r"\b(?P<marker>" + alternation + r")\b"
+            r"(?:" + _SP + r"\([^)\n;|]{0,20}\))?[ \t:=\-]*"
+            r"(?P<value>" + _NUMBER + r")"
+            r"(?:" + _SP + r"(?P<mult>lakhs?|lacs?|thousand|k)\b)?"
+            r"(?:" + _SP + r"(?P<unit>" + _UNIT + r"))?",
+            re.IGNORECASE
+        )
+
+    def parse(self, text):
+        """Return a list of LabReading objects found in `text`."""
+        return list(self.iter_readings(text))
+
+    def iter_readings(self, text):
+        for match in self.pattern.finditer(text):
+            reading = self._to_reading(match)
+            if reading is not None:
+                yield reading
+
+    def parse_stream(self, stream):
+        """Yield readings from a text stream, reading it in fixed-size chunks."""
+        carry = ""
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                break
+            buffer = carry + chunk
+
+            # Only parse up to the last safe separator; the rest waits for the next chunk
+            cut = max(buffer.rfind(sep) for sep in _BOUNDARIES) + 1
+            if cut == 0 and len(buffer) > self.chunk_size:
+                # A single huge line: emit readings that more text can no longer change
+                # and carry the rest, so the carry stays bounded
+                limit = len(buffer) - _MAX_READING
+                done = 0
+                for match in self.pattern.finditer(buffer):
+                    if match.end() > limit:
+                        limit = match.start()
+                        break
+                    reading = self._to_reading(match)
+                    if reading is not None:
+                        yield reading
+                    done = match.end()
+                # Resume at a word start so the carry doesn't begin mid-word; with no
+                # space to resume at, cut at the limit anyway to keep the carry bounded
+                space = buffer.rfind(" ", done, limit)
+                carry = buffer[space + 1 if space >= 0 else max(done, limit):]
+                continue
+
+            yield from self.iter_readings(buffer[:cut])
+            carry = buffer[cut:]
+
+        if carry:
+            yield from self.iter_readings(carry)
+
+    def parse_file(self, path, encoding="utf-8"):
+        """Yield readings from a (possibly multi-gigabyte) lab export on disk."""
+        with io.open(path, "r", encoding=encoding, errors="replace") as f:
+            yield from self.parse_stream(f)
+
+    def _to_reading(self, match):
+        marker_text, value_text, mult, unit = match.group("marker", "value", "mult", "unit")
+        marker = self.alias_to_marker[marker_text.lower()]
+        ref = self.lab_markers[marker]
+        value = _parse_number(value_text)
+
+        if mult:
+            value *= MULTIPLIERS[mult.lower()]
+
+        if unit:
+            unit_key = _normalise_unit(unit)
+            factor = UNIT_FACTORS.get(marker, {}).get(unit_key)
+            if factor is None and unit_key == _normalise_unit(ref["unit"]):
+                # Markers added through content files: accept their own reference unit
+                factor = 1.0
+            if factor is None:
+                # Unknown unit for this marker: don't guess a conversion
+                return None
+            value *= factor
+        elif _NOT_A_RESULT.match(match.string, match.end()) or not (
+                ref["min"] / _PLAUSIBLE_FACTOR <= value <= ref["max"] * _PLAUSIBLE_FACTOR):
+            # No unit to vouch for it: "platelets 2 days ago" is not a platelet count
+            return None
+
+        if value < ref["min"]:
+            status, note = "low", ref["low"]
+        elif value > ref["max"]:
+            status, note = "high", ref["high"]
+        else:
+            status, note = "normal", ""
+
+        return LabReading(marker, round(value, 2), ref["unit"], status, note, match.group(0).strip())
+
+
+def parse_lab_text(text, lab_markers=None):
+    """Convenience wrapper for one-off parsing of a pasted lab report."""
+    return LabReportParser(lab_markers).parse(text)
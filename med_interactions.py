@@ -0,0 +1,174 @@
+# Standard imports
+import re
+from collections import namedtuple
+
+Interaction = namedtuple("Interaction", ["first", "second", "severity", "note", "entries"])
+Duplicate = namedtuple("Duplicate", ["ingredient", "entries"])
+# Two or more ingredients from one drug class (e.g. two NSAIDs)
+ClassDuplicate = namedtuple("ClassDuplicate", ["cls", "ingredients", "entries"])
+CheckResult = namedtuple("CheckResult", ["interactions", "duplicates", "resolved", "unresolved", "class_duplicates"])
+
+# Canonical active ingredients and the names they are sold or written under
+INGREDIENTS = {
+    "paracetamol": ["paracetamol", "acetaminophen", "crocin", "dolo", "calpol", "tylenol", "panadol", "pcm"],
+    "ibuprofen": ["ibuprofen", "brufen", "advil", "motrin", "ibugesic"],
+    "aspirin": ["aspirin", "disprin", "ecosprin", "acetylsalicylic acid"],
+    "diclofenac": ["diclofenac", "voveran", "voltaren"],
+    "naproxen": ["naproxen", "naprosyn", "aleve"],
+    "caffeine": ["caffeine"],
+    "propyphenazone": ["propyphenazone"],
+    "guaifenesin": ["guaifenesin"],
+    "dextromethorphan": ["dextromethorphan", "dxm"],
+    "phenylephrine": ["phenylephrine"],
+    "pseudoephedrine": ["pseudoephedrine", "sudafed"],
+    "chlorpheniramine": ["chlorpheniramine", "cpm"],
+    "cetirizine": ["cetirizine", "cetzine", "zyrtec"],
+    "warfarin": ["warfarin", "coumadin"],
+    "clopidogrel": ["clopidogrel", "clopilet", "plavix"],
+    "metformin": ["metformin", "glycomet"],
+    "amlodipine": ["amlodipine", "amlong"],
+    "sertraline": ["sertraline"],
+    "fluoxetine": ["fluoxetine", "prozac"],
+}
+
+# Brands that combine several active ingredients in one tablet
+COMBINATIONS = {
+    "combiflam": ["ibuprofen", "paracetamol"],
+    "saridon": ["paracetamol", "propyphenazone", "caffeine"],
+    "sinarest": ["paracetamol", "phenylephrine", "chlorpheniramine", "caffeine"],
+    "d cold": ["paracetamol", "phenylephrine", "chlorpheniramine"],
+    "vicks action": ["paracetamol", "phenylephrine", "caffeine"],
+}
+
+# Drug classes where taking two members at once is a therapeutic duplication
+CLASSES = {
+    "NSAID": ["ibuprofen", "aspirin", "diclofenac", "naproxen"],
+    "decongestant": ["phenylephrine", "pseudoephedrine"],
+    "antihistamine": ["chlorpheniramine", "cetirizine"],
+    "SSRI": ["sertraline", "fluoxetine"],
+}
+
+# Pairwise interactions: (ingredient, ingredient, severity, note)
+INTERACTIONS = [
+    ("ibuprofen", "aspirin", "moderate", "Ibuprofen can blunt aspirin's heart-protective effect and both raise stomach bleeding risk."),
+    ("warfarin", "aspirin", "major", "Greatly increases the risk of serious bleeding."),
+    ("warfarin", "ibuprofen", "major", "Greatly increases the risk of serious bleeding."),
+    ("warfarin", "diclofenac", "major", "Greatly increases the risk of serious bleeding."),
+    ("warfarin", "naproxen", "major", "Greatly increases the risk of serious bleeding."),
+    ("warfarin", "paracetamol", "minor", "Regular high doses of paracetamol can raise INR; keep doses low and occasional."),
+    ("clopidogrel", "aspirin", "moderate", "Combined antiplatelet effect increases bleeding risk; only take together if prescribed."),
+    ("clopidogrel", "ibuprofen", "moderate", "Increases the risk of stomach bleeding."),
+    ("sertraline", "aspirin", "moderate", "SSRIs with NSAIDs increase the risk of stomach bleeding."),
+    ("sertraline", "ibuprofen", "moderate", "SSRIs with NSAIDs increase the risk of stomach bleeding."),
+    ("fluoxetine", "ibuprofen", "moderate", "SSRIs with NSAIDs increase the risk of stomach bleeding."),
+    ("fluoxetine", "aspirin", "moderate", "SSRIs with NSAIDs increase the risk of stomach bleeding."),
+    ("dextromethorphan", "sertraline", "major", "Risk of serotonin syndrome."),
+    ("dextromethorphan", "fluoxetine", "major", "Risk of serotonin syndrome."),
+    ("amlodipine", "ibuprofen", "minor", "NSAIDs can reduce the blood-pressure-lowering effect."),
+    ("amlodipine", "pseudoephedrine", "moderate", "Decongestants can raise blood pressure."),
+    ("amlodipine", "phenylephrine", "moderate", "Decongestants can raise blood pressure."),
+]
+
+# Dosage and form words that should not stop a name from resolving ("Dolo 650 tablet")
+_NOISE = re.compile(r"\b\d+(?:\.\d+)?\s*(?:mg|mcg|g|ml)?\b|\b(?:tablet|tab|tabs|capsule|cap|syrup|ds|sr|er|plus|forte)\b")
+
+
+class InteractionChecker:
+    """Precomputed interaction index over canonical ingredient IDs.
+
+    Every ingredient gets an integer ID and an adjacency bitset (a Python
+    int) of the IDs it interacts with, so checking a medication list is a
+    handful of bitwise ANDs rather than a pairwise scan of the table.
+    """
+
+    def __init__(self):
+        self.ingredients = list(INGREDIENTS)
+        self.ids = {name: i for i, name in enumerate(self.ingredients)}
+
+        # Alias -> tuple of ingredient IDs (combination brands map to several)
+        self.aliases = {}
+        for name, names in INGREDIENTS.items():
+            for alias in names:
+                self.aliases[alias] = (self.ids[name],)
+        for brand, parts in COMBINATIONS.items():
+            self.aliases[brand] = tuple(self.ids[p] for p in parts)
+        self.max_alias_words = max(len(a.split()) for a in self.aliases)
+
+        self.adjacency = [0] * len(self.ingredients)
+        self.notes = {}
+        for a, b, severity, note in INTERACTIONS:
+            i, j = self.ids[a], self.ids[b]
+            self.adjacency[i] |= 1 << j
+            self.adjacency[j] |= 1 << i
+            self.notes[(min(i, j), max(i, j))] = (severity, note)
+
+        self.class_masks = {}
+        for cls, members in CLASSES.items():
+            self.class_masks[cls] = sum(1 << self.ids[m] for m in members)
+
+    def resolve(self, entry):
+        """Return the ingredient IDs for a free-text checklist entry."""
+        text = _NOISE.sub(" ", entry.lower())
+        words = re.findall(r"[a-z]+", text)
+        found = []
+        i = 0
+        while i < len(words):
+            # Greedy longest alias match ("acetylsalicylic acid" before "acid")
+            for size in range(min(self.max_alias_words, len(words) - i), 0, -1):
+                ids = self.aliases.get(" ".join(words[i:i + size]))
+                if ids:
+                    found.extend(x for x in ids if x not in found)
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
+
+    def check(self, entries):
+        """Check a list of medicine names for interactions and duplicate ingredients."""
+        seen_mask = 0
+        sources = {}
+        resolved = {}
+        unresolved = []
+        duplicate_ids = []
+
+        for entry in entries:
+            ids = self.resolve(entry)
+            if not ids:
+                unresolved.append(entry)
+                continue
+            resolved[entry] = [self.ingredients[i] for i in ids]
+            for i in ids:
+                if seen_mask >> i & 1 and i not in duplicate_ids:
+                    duplicate_ids.append(i)
+                seen_mask |= 1 << i
+                sources.setdefault(i, []).append(entry)
+
+        duplicates = [Duplicate(self.ingredients[i], sources[i]) for i in duplicate_ids]
+
+        interactions = []
+        for i in sources:
+            # Only partners with a higher ID, so each pair is reported once
+            partners = self.adjacency[i] & seen_mask & ~((2 << i) - 1)
+            while partners:
+                low = partners & -partners
+                partners ^= low
+                j = low.bit_length() - 1
+                severity, note = self.notes[(i, j)]
+                interactions.append(Interaction(self.ingredients[i], self.ingredients[j], severity, note,
+                                                sources[i] + [e for e in sources[j] if e not in sources[i]]))
+
+        # Two members of one drug class (e.g. two NSAIDs) is a therapeutic duplication
+        class_duplicates = []
+        for cls, mask in self.class_masks.items():
+            members = [i for i in sources if mask >> i & 1]
+            if len(members) < 2:
+                continue
+            if len(members) == 2 and (min(members), max(members)) in self.notes:
+                continue
+            entries_in_class = []
+            for i in members:
+                entries_in_class.extend(e for e in sources[i] if e not in entries_in_class)
+            class_duplicates.append(ClassDuplicate(cls, [self.ingredients[i] for i in members], entries_in_class))
+
+        return CheckResult(interactions, duplicates, resolved, unresolved, class_duplicates)
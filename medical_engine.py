@@ -3,11 +3,47 @@ import random
 import re
 import datetime
 import io
+import json
+import os
+import threading
+import time
+
+from content_reload import ContentWatcher, KnowledgeSnapshot, load_content_file, thaw
+from query_log import QueryLogger
+from query_normalizer import HINGLISH_VARIANTS, NormalizedQuery, normalize
+from query_profiler import QueryProfiler
+from responses import Response, Section
+from typeahead import build_index
+
+# Common Hindi stop-words written in Roman script, in the spelling normalize() produces
+HINGLISH_KEYWORDS = frozenset(HINGLISH_VARIANTS.get(w, w) for w in {
+    "hai", "kya", "ka", "ki", "ko", "mein", "mai", "bhi", "toh", "kar", "hoga", 
+    "sakta", "nahi", "pe", "mil", "de", "do", "aap", "hu", "tha", "rahe",
+    "raha", "chahiye", "karna", "ke", "ne", "liye", "kya", "bataye", "batana",
+    "ho", "rha", "rhi", "hu", "tha", "thi", "rhe", "karne", "wali", "wala",
+    "sir", "madam", "doktor", "doctor", "medicine", "dawaim", "dawae", "btaye"
+})
+# Keywords that are also everyday English words ("how do I...", "doctor"); they
+# only mark a query as Hinglish when at least two of them appear
+WEAK_HINGLISH_KEYWORDS = frozenset({"do", "de", "ho", "pe", "sir", "madam", "doctor", "medicine"})
+STRONG_HINGLISH_KEYWORDS = HINGLISH_KEYWORDS - WEAK_HINGLISH_KEYWORDS
+
+GREETINGS = frozenset({"hello", "hi", "hey", "namaste", "नमस्ते"})
+
 
 class MedicalEngine:
     def __init__(self):
+        # Opt-in audit trail; see enable_query_log() or HEALTH_ASSISTANT_QUERY_LOG
+        self.query_logger = None
+        # Opt-in slow-query profiling; see enable_profiling() or HEALTH_ASSISTANT_PROFILE_DIR
+        self.profiler = None
+        self._watcher = None
+        self._reload_lock = threading.Lock()
+        # Ranks typeahead suggestions; see set_popularity()
+        self._popularity = {}
+
         # Structured knowledge base with patient-friendly explanations and consultation triggers
-        self.knowledge_base = {
+        knowledge_base = {
             "headache": {
                 "explanation": "A headache is pain or discomfort in the head or face area. They can range from minor annoyances to severe pain.",
                 "common_causes": [
@@ -219,20 +255,19 @@ class MedicalEngine:
         }
 
         # Lab Markers Reference (Simplified)
-        self.lab_markers = {
+        lab_markers = {
             "hemoglobin": {"min": 13.5, "max": 17.5, "unit": "g/dL", "low": "Potential Anemia", "high": "Polycythemia"},
             "glucose": {"min": 70, "max": 100, "unit": "mg/dL", "low": "Hypoglycemia", "high": "Potential Diabetes/Hyperglycemia"},
             "wbc": {"min": 4500, "max": 11000, "unit": "cells/mcL", "low": "Weakened Immune System", "high": "Infection or Inflammation"},
             "platelets": {"min": 150000, "max": 450000, "unit": "mcL", "low": "Thrombocytopenia (Bleeding risk)", "high": "Thrombocytosis (Clotting risk)"}
         }
-
-        self.emergency_keywords = [
+        emergency_keywords = [
             "chest pain", "can't breathe", "shortness of breath", "stroke", 
             "unconscious", "heavy bleeding", "seizure", "poison", "worst headache"
         ]
 
         # Translation Mappings
-        self.translations = {
+        translations = {
             "en": {
                 "understanding": "Understanding",
                 "what_it_is": "What it is",
@@ -252,7 +287,8 @@ class MedicalEngine:
                 "emergency_title": "URGENT MEDICAL ADVICE: IMMEDIATE ACTION REQUIRED",
                 "emergency_steps": "Please take the following steps immediately:",
                 "emergency_disclaimer": "*This chatbot is for informational purposes and cannot provide emergency medical care.*",
-                "lab_interpretation": "Lab Interpretation Report"
+                "lab_interpretation": "Lab Interpretation Report",
+                "otc_caution": "**Always consult a pharmacist or doctor before taking new medication.** Check for allergies, dosages, and interactions."
             },
             "hi": {
                 "understanding": "समझना",
@@ -273,7 +309,8 @@ class MedicalEngine:
                 "emergency_title": "तत्काल चिकित्सा सलाह: तत्काल कार्रवाई की आवश्यकता है",
                 "emergency_steps": "कृपया तुरंत निम्नलिखित कदम उठाएं:",
                 "emergency_disclaimer": "*यह चैटबॉट केवल सूचनात्मक उद्देश्यों के लिए है और आपातकालीन चिकित्सा देखभाल प्रदान नहीं कर सकता है।*",
-                "lab_interpretation": "लैब व्याख्या रिपोर्ट"
+                "lab_interpretation": "लैब व्याख्या रिपोर्ट",
+                "otc_caution": "**नई दवा लेने से पहले हमेशा फार्मासिस्ट या डॉक्टर से सलाह लें।** एलर्जी, खुराक और बातचीत की जांच करें।"
             },
             "hinglish": {
                 "understanding": "Understanding",
@@ -294,165 +331,327 @@ class MedicalEngine:
                 "emergency_title": "URGENT MEDICAL ADVICE: IMMEDIATE ACTION REQUIRED",
                 "emergency_steps": "Please jaldi ye steps follow karein:",
                 "emergency_disclaimer": "*Ye chatbot sirf info ke liye hai aur emergency care provide nahi kar sakta.*",
-                "lab_interpretation": "Lab Interpretation Report"
+                "lab_interpretation": "Lab Interpretation Report",
+                "otc_caution": "**Nayi medicine lene se pehle hamesha pharmacist ya doctor se consult karein.** Allergies aur dosage zarur check karein."
             }
         }
 
+        # Built-in content; a JSON content file (see reload_content) is overlaid on top of it
+        self._builtin_content = {
+            "knowledge_base": knowledge_base,
+            "lab_markers": lab_markers,
+            "emergency_keywords": emergency_keywords,
+            "translations": translations
+        }
+        # All per-query state is read from this frozen snapshot, so one engine can be
+        # shared by many threads (see parallel.QueryExecutor)
+        self._snapshot = KnowledgeSnapshot(self._builtin_content)
+
+    # Current content, read from the active snapshot
+    @property
+    def content_version(self):
+        return self._snapshot.version
+
+    @property
+    def knowledge_base(self):
+        return self._snapshot.knowledge_base
+
+    @property
+    def lab_markers(self):
+        return self._snapshot.lab_markers
+
+    @property
+    def emergency_keywords(self):
+        return self._snapshot.emergency_keywords
+
+    @property
+    def translations(self):
+        return self._snapshot.translations
+
+    def reload_content(self, path=None):
+        """Build a new snapshot from `path` (or the built-in content) and swap it in atomically."""
+        with self._reload_lock:
+            content = load_content_file(path, self._builtin_content) if path else self._builtin_content
+            snapshot = KnowledgeSnapshot(content, self._snapshot.version + 1, self._popularity)
+            # Single reference assignment: queries already running keep the old snapshot
+            self._snapshot = snapshot
+        return snapshot.version
+
+    def watch_content(self, path, interval=2.0):
+        """Load a JSON content file now and hot-reload it whenever it changes."""
+        self.stop_watching()
+        # Start watching before the first load, so an edit landing during it is picked up
+        watcher = ContentWatcher(self, path, interval)
+        try:
+            self.reload_content(path)
+        except Exception:
+            watcher.stop()
+            raise
+        self._watcher = watcher
+        return watcher
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def export_content(self, path):
+        """Write the current content as JSON, a starting point for a content file."""
+        snap = self._snapshot
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "knowledge_base": thaw(snap.knowledge_base),
+                "lab_markers": thaw(snap.lab_markers),
+                "emergency_keywords": thaw(snap.emergency_keywords),
+                "translations": thaw(snap.translations)
+            }, f, ensure_ascii=False, indent=2)
+
     def detect_language(self, text):
         """Automatically detect language: English, Hindi, or Hinglish."""
+        nq = text if isinstance(text, NormalizedQuery) else normalize(text)
+
         # 1. Detect Hindi (Devanagari script)
-        if any('\u0900' <= char <= '\u097F' for char in text):
+        if nq.has_devanagari:
             return "hi"
         
         # 2. Detect Hinglish (Heuristic keywords/patterns)
         # We look for common Hindi stop-words or sentence endings written in Roman script
-        hinglish_keywords = {
-            "hai", "kya", "ka", "ki", "ko", "mein", "bhi", "toh", "kar", "hoga", 
-            "sakta", "nahi", "pe", "mil", "de", "do", "aap", "hu", "tha", "rahe",
-            "raha", "chahiye", "karna", "ke", "ne", "liye", "kya", "bataye", "batana",
-            "ho", "rha", "rhi", "hu", "tha", "thi", "rhe", "karne", "wali", "wala",
-            "sir", "madam", "doktor", "doctor", "medicine", "dawaim", "dawae", "btaye"
-        }
-        words = set(text.lower().replace("?", "").replace(".", "").replace(",", "").split())
-        
-        if not words.isdisjoint(hinglish_keywords):
+        if nq.has_any(STRONG_HINGLISH_KEYWORDS) or len(nq.token_set & WEAK_HINGLISH_KEYWORDS) >= 2:
             return "hinglish"
             
         return "en"
 
+    def check_medications(self, names):
+        """Resolve medicine names to ingredients and flag interactions and duplicates."""
+        return self._snapshot.med_checker.check(names)
+
+    def suggest(self, prefix, k=5):
+        """Top-k topics, aliases and lab markers matching partially typed input."""
+        return self._snapshot.typeahead.suggest(prefix, k)
+
+    def set_popularity(self, counts):
+        """Re-rank suggestions by how often each topic/marker is asked about.
+
+        `counts` maps topic or lab marker names to counts, e.g. from
+        typeahead.popularity_from_log(). Kept across content reloads.
+        """
+        with self._reload_lock:
+            self._popularity = dict(counts)
+            snap = self._snapshot
+            # Single reference assignment, like a reload
+            snap.typeahead = build_index(snap.knowledge_base, snap.lab_markers, self._popularity)
+
     def process_query(self, query, lang=None):
+        """Answer a query as a markdown string (thin wrapper over answer())."""
+        return self.answer(query, lang).to_markdown()
+
+    def answer(self, query, lang=None):
+        """Answer a query as a structured Response that renders to markdown, HTML, text or JSON."""
+        # Read each once: another thread may disable them while this query runs
+        logger, profiler = self.query_logger, self.profiler
+        if logger is None and profiler is None:
+            return self._route(query, lang)
+
+        start = time.perf_counter()
+        if profiler is None:
+            response = self._route(query, lang)
+        else:
+            response = profiler.call(self, query, lang)
+        if logger is None:
+            return response
+        logger.log({
+            "ts": time.time(),
+            "query": query,
+            "lang": response.lang,
+            "branch": response.kind,
+            "topics": list(response.topics),
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3)
+        })
+        return response
+
+    def _route(self, query, lang=None, use_cache=True):
+        # Take the snapshot once so a concurrent reload can't change content mid-query
+        snap = self._snapshot
+        cached = self._cached if use_cache else self._uncached
+        # Normalise once; every check below works on the same tokens
+        nq = normalize(query)
         if lang is None:
-            lang = self.detect_language(query)
-            
-        query_lower = query.lower()
-        t = self.translations.get(lang, self.translations["en"])
+            lang = self.detect_language(nq)
+
+        t = snap.translations.get(lang, snap.translations["en"])
 
         # 1. Check for Emergency
-        for kw in self.emergency_keywords:
-            if kw in query_lower:
-                return self._format_emergency_response(kw, t)
+        for kw, pattern in snap.emergency_patterns:
+            if pattern.search(nq.text):
+                return cached(snap, ("emergency", kw, lang), self._format_emergency_response, kw, t, lang)
 
-        # 2. Identify All Matches
+        # 2. Identify All Matches (at word starts, so "feverish" finds fever but nothing matches mid-word)
         matched_topics = []
-        for topic in self.knowledge_base:
-            if topic in query_lower:
+        for topic, pattern in snap.topic_patterns:
+            if pattern.search(nq.text):
                 matched_topics.append(topic)
-        
-        # 3. Handle Matches
+
         if len(matched_topics) == 1:
-            return self._format_detailed_response(matched_topics[0], t)
+            response = cached(snap, ("topic", matched_topics[0], lang), self._format_detailed_response, snap, matched_topics[0], t, lang)
         elif len(matched_topics) > 1:
-            return self._format_multi_condition_response(matched_topics, t)
-
-        # 4. Handle Greeting/General
-        if any(greet in query_lower for greet in ["hello", "hi", "hey"]):
-            if lang == "hi":
-                return "नमस्ते! मैं आपका हेल्थ असिस्टेंट हूं। मैं चिकित्सा स्थितियों के बारे में बता सकता हूं और आपको यह तय करने में मदद कर सकता हूं कि क्या आपको डॉक्टर को देखने की आवश्यकता है। आज आपके मन में क्या है?"
-            elif lang == "hinglish":
-                return "Hello! Main aapka Health Assistant hoon. Main medical conditions ke bare mein bata sakta hoon aur aapki help kar sakta hoon decide karne mein ki doctor se milna chahiye ya nahi. Aaj kya help chahiye?"
-            return "Hello! I'm your Health Assistant. I can explain medical conditions in simple terms and help you decide if you need to see a doctor. What's on your mind today?"
-
-        return self._format_fallback_response(query, t)
-
+            response = cached(snap, ("multi_topic", tuple(matched_topics), lang), self._format_multi_condition_response, snap, matched_topics, t, lang)
+        else:
+            response = None
+
+        # 3. Check for pasted lab values (e.g. "Hemoglobin 11.2 g/dL, WBC 12,400"); alongside
+        # a topic ("anemia, hb 9") the readings are added to the topic answer
+        readings = snap.lab_parser.parse(query)
+        if readings:
+            return self._format_lab_response(snap, readings, t, lang, response)
+
+        # 4. Handle Matches
+        if response is not None:
+            return response
+
+        # 5. Handle Greeting/General
+        if nq.has_any(GREETINGS):
+            return cached(snap, ("greeting", lang), self._format_greeting_response, lang)
+
+        return self._format_fallback_response(nq, t, lang)
+
+    def _cached(self, snap, key, build, *args):
+        """Reuse deterministic responses (and their per-format renders) within one content version."""
+        cache = snap.response_cache
+        response = cache.get(key)
+        if response is None:
+            if len(cache) >= 2048:
+                cache.clear()
+            response = cache[key] = build(*args)
+        return response
 
+    @staticmethod
+    def _uncached(snap, key, build, *args):
+        # Used when profiling, so a replayed query does the real work again
+        return build(*args)
+
+    def enable_query_log(self, path, **options):
+        """Start writing a structured JSONL audit trail of queries (opt-in)."""
+        self.disable_query_log()
+        self.query_logger = QueryLogger(path, **options)
+        return self.query_logger
+
+    def disable_query_log(self):
+        # Detach first, so answer() never sees an instance that is shutting down
+        observer, self.query_logger = self.query_logger, None
+        if observer is not None:
+            observer.close()
+
+    def enable_profiling(self, directory, **options):
+        """Profile a sample of queries plus any slow query into `directory` (opt-in)."""
+        self.disable_profiling()
+        self.profiler = QueryProfiler(directory, **options)
+        return self.profiler
+
+    def disable_profiling(self):
+        # Detach first, so answer() never sees an instance that is shutting down
+        observer, self.profiler = self.profiler, None
+        if observer is not None:
+            observer.close()
+
+    def _format_greeting_response(self, lang):
+        if lang == "hi":
+            text = "नमस्ते! मैं आपका हेल्थ असिस्टेंट हूं। मैं चिकित्सा स्थितियों के बारे में बता सकता हूं और आपको यह तय करने में मदद कर सकता हूं कि क्या आपको डॉक्टर को देखने की आवश्यकता है। आज आपके मन में क्या है?"
+        elif lang == "hinglish":
+            text = "Hello! Main aapka Health Assistant hoon. Main medical conditions ke bare mein bata sakta hoon aur aapki help kar sakta hoon decide karne mein ki doctor se milna chahiye ya nahi. Aaj kya help chahiye?"
+        else:
+            text = "Hello! I'm your Health Assistant. I can explain medical conditions in simple terms and help you decide if you need to see a doctor. What's on your mind today?"
+        return Response("greeting", lang, [Section("greeting", intro=text)])
 
-    def _format_multi_condition_response(self, topics, t):
-        summary = f"## Potential Related Conditions\n\n"
-        summary += f"Based on your symptoms, I found several related health topics: **{', '.join([t.capitalize() for t in topics])}**.\n\n"
-        summary += "Here is a quick overview of how these may be related:\n\n"
-        
+    def _format_multi_condition_response(self, snap, topics, t, lang):
+        sections = [
+            Section("summary", intro=f"Based on your symptoms, I found several related health topics: **{', '.join([t.capitalize() for t in topics])}**."),
+            Section("overview", intro="Here is a quick overview of how these may be related:")
+        ]
         for topic in topics:
-            data = self.knowledge_base[topic]
-            summary += f"### {topic.capitalize()}\n"
-            summary += f"{data['explanation']}\n\n"
-        
-        summary += "---\n### 🩺 Next Steps\n"
-        summary += f"Since you are experiencing multiple symptoms, it is highly recommended to **consult a healthcare professional** for a proper diagnosis. They can determine if these are linked.\n\n"
-        summary += f"{t['disclaimer']}"
-        return summary
-
-    def _format_emergency_response(self, keyword, t):
-        return f"""
-### 🚨 {t['emergency_title']}
-
-You mentioned **{keyword}**, which can be a sign of a life-threatening emergency.
-
-**{t['emergency_steps']}**
-1. **Call emergency services (e.g., 911 or 108)** right now.
-2. Do not attempt to drive yourself to the hospital.
-3. Stay on the line with the emergency operator and follow their instructions.
-
-{t['emergency_disclaimer']}
-"""
+            data = snap.knowledge_base[topic]
+            sections.append(Section(topic, title=topic.capitalize(), intro=data['explanation']))
+        sections.append(Section("next_steps", title="Next Steps", icon="🩺", rule=True,
+                                intro="Since you are experiencing multiple symptoms, it is highly recommended to **consult a healthcare professional** for a proper diagnosis. They can determine if these are linked."))
+
+        return Response("multi_topic", lang, sections, title="Potential Related Conditions",
+                        footer=t['disclaimer'], footer_rule=False, topics=topics)
+
+    def _format_lab_response(self, snap, readings, t, lang, answer=None):
+        rows = []
+        for r in readings:
+            ref = snap.lab_markers[r.marker]
+            status = r.status.capitalize()
+            if r.note:
+                status += f" ({r.note})"
+            rows.append((r.marker.upper() if r.marker == 'wbc' else r.marker.capitalize(), f"{r.value:g} {r.unit}",
+                         f"{ref['min']:g} - {ref['max']:g} {r.unit}", status))
+
+        sections = [
+            Section("readings", table=(("Marker", "Value", "Normal Range", "Status"), rows)),
+            Section("note", intro="*Reference ranges vary between labs, age and sex. Your doctor should interpret these values alongside your symptoms.*")
+        ]
+        abnormal = any(r.status != "normal" for r in readings)
+        if answer is not None:
+            # Never mutate `answer`: it is shared through the response cache
+            sections[0] = Section("readings", title=t['lab_interpretation'], icon="🧪", table=sections[0].table)
+            return Response(answer.kind, lang, answer.sections + tuple(sections), title=answer.title,
+                            footer=answer.footer, severity="warning" if abnormal else answer.severity,
+                            topics=answer.topics)
+        return Response("lab", lang, sections, title=f"🧪 {t['lab_interpretation']}", footer=t['disclaimer'],
+                        severity="warning" if abnormal else "info")
+
+    def _format_emergency_response(self, keyword, t, lang):
+        sections = [
+            Section("emergency", title=t['emergency_title'], icon="🚨"),
+            Section("keyword", intro=f"You mentioned **{keyword}**, which can be a sign of a life-threatening emergency."),
+            Section("steps", title=t['emergency_steps'], style="label", ordered=True, items=[
+                "**Call emergency services (e.g., 911 or 108)** right now.",
+                "Do not attempt to drive yourself to the hospital.",
+                "Stay on the line with the emergency operator and follow their instructions."
+            ])
+        ]
+        return Response("emergency", lang, sections, footer=t['emergency_disclaimer'], footer_rule=False,
+                        severity="emergency")
 
-    def _format_detailed_response(self, topic, t):
-        data = self.knowledge_base[topic]
-        response = f"## {t['understanding']} {topic.capitalize()}\n\n"
-        response += f"**{t['what_it_is']}:** {data['explanation']}\n\n"
+    def _format_detailed_response(self, snap, topic, t, lang):
+        data = snap.knowledge_base[topic]
+        sections = [Section("what_it_is", intro=f"**{t['what_it_is']}:** {data['explanation']}")]
 
         if "common_causes" in data:
-            response += f"### {t['common_causes']}\n"
-            for cause in data['common_causes']:
-                response += f"- {cause}\n"
-            response += "\n"
+            sections.append(Section("common_causes", title=t['common_causes'], items=data['common_causes']))
 
         if "self_care" in data:
-            response += f"### {t['self_care']}\n"
-            for item in data['self_care']:
-                response += f"- {item}\n"
-            response += "\n"
+            sections.append(Section("self_care", title=t['self_care'], items=data['self_care']))
         
         if "tips" in data:
-            response += f"### {t['tips']}\n"
-            for tip in data['tips']:
-                response += f"- {tip}\n"
-            response += "\n"
+            sections.append(Section("tips", title=t['tips'], items=data['tips']))
 
         if "common_otc_relief" in data:
-            response += f"### 💊 {t['otc_relief']}\n"
-            caution = "> [!CAUTION]\n> **Always consult a pharmacist or doctor before taking new medication.** Check for allergies, dosages, and interactions.\n\n"
-            if t == self.translations["hi"]:
-                caution = "> [!CAUTION]\n> **नई दवा लेने से पहले हमेशा फार्मासिस्ट या डॉक्टर से सलाह लें।** एलर्जी, खुराक और बातचीत की जांच करें।\n\n"
-            elif t == self.translations["hinglish"]:
-                caution = "> [!CAUTION]\n> **Nayi medicine lene se pehle hamesha pharmacist ya doctor se consult karein.** Allergies aur dosage zarur check karein.\n\n"
-            
-            response += caution
-            for medicine in data['common_otc_relief']:
-                response += f"- {medicine}\n"
-            response += "\n"
+            sections.append(Section("otc_relief", title=t['otc_relief'], icon="💊", callout=t['otc_caution'],
+                                    items=data['common_otc_relief']))
 
         if "common_profiles" in data:
-            response += f"### 📊 {t['diagnostic_profiles']}\n"
-            for profile in data['common_profiles']:
-                response += f"- {profile}\n"
-            response += "\n"
+            sections.append(Section("diagnostic_profiles", title=t['diagnostic_profiles'], icon="📊", items=data['common_profiles']))
 
         if "tests_to_get" in data:
-            response += f"### 🧪 {t['recommended_tests']}\n"
-            response += f"{t['tests_desc']}\n"
-            for test in data['tests_to_get']:
-                response += f"- {test}\n"
-            response += "\n"
+            sections.append(Section("recommended_tests", title=t['recommended_tests'], icon="🧪", intro=t['tests_desc'],
+                                    items=data['tests_to_get']))
 
         if "actions_to_take" in data:
-            response += f"### ✅ {t['actions']}\n"
-            for action in data['actions_to_take']:
-                response += f"- {action}\n"
-            response += "\n"
-
-        response += f"### 🩺 {t['consult_doctor']}\n"
-        response += f"{t['consult_desc']}\n"
-        for condition in data['consult_doctor_if']:
-            response += f"- {condition}\n"
-        
-        response += f"\n---\n{t['disclaimer']}"
-        return response
+            sections.append(Section("actions", title=t['actions'], icon="✅", items=data['actions_to_take']))
+
+        sections.append(Section("consult_doctor", title=t['consult_doctor'], icon="🩺", intro=t['consult_desc'],
+                                items=data['consult_doctor_if']))
+
+        return Response("topic", lang, sections, title=f"{t['understanding']} {topic.capitalize()}",
+                        footer=t['disclaimer'], topics=[topic])
 
-    def _format_fallback_response(self, query, t):
+    def _format_fallback_response(self, nq, t, lang):
         # "Smart Brain" simulation: Identify intent and provide agentic feedback
+        query = nq.original
         intent = "general"
-        if any(w in query.lower() for w in ["how", "why", "what", "tell me"]): intent = "explanation"
-        if any(w in query.lower() for w in ["help", "do", "action"]): intent = "advice"
+        if nq.has_any(("how", "why", "what")) or "tell me" in nq.text: intent = "explanation"
+        if nq.has_any(("help", "do", "action")): intent = "advice"
 
         intro = f"{t['fallback_intro']} **\"{query}\"**."
         
@@ -463,23 +662,28 @@ You mentioned **{keyword}**, which can be a sign of a life-threatening emergency
         else:
             middle = t['fallback_general']
 
-        return f"""
-{intro} {middle}
-
-**My Thought Process:**
-1. Search recognized medical conditions (Headache, Fever, Diabetes, etc.) -> **No exact match.**
-2. Provide general wellness guidance and safety indicators.
-
-**General Guidance:**
-- **Observe**: Notice any new symptoms or changes in existing ones.
-- **Hydrate**: Drink enough water for better recovery.
-- **Rest**: Give your body time to heal.
-
-**When to seek immediate help:**
-If you have a high fever, sudden intense pain, or trouble breathing, please go to the nearest emergency center (A&E).
-
-*Would you like to ask about a specific condition like 'Headache' or 'Diabetes' instead?*
-"""
+        sections = [
+            Section("intro", intro=f"{intro} {middle}"),
+            Section("thought_process", title="My Thought Process:", style="label", ordered=True, items=[
+                "Search recognized medical conditions (Headache, Fever, Diabetes, etc.) -> **No exact match.**",
+                "Provide general wellness guidance and safety indicators."
+            ]),
+            Section("general_guidance", title="General Guidance:", style="label", items=[
+                "**Observe**: Notice any new symptoms or changes in existing ones.",
+                "**Hydrate**: Drink enough water for better recovery.",
+                "**Rest**: Give your body time to heal."
+            ]),
+            Section("seek_help", title="When to seek immediate help:", style="label",
+                    intro="If you have a high fever, sudden intense pain, or trouble breathing, please go to the nearest emergency center (A&E).")
+        ]
+        return Response("fallback", lang, sections, footer_rule=False,
+                        footer="*Would you like to ask about a specific condition like 'Headache' or 'Diabetes' instead?*")
 
 # Singleton instance
 engine = MedicalEngine()
+if os.environ.get("HEALTH_ASSISTANT_CONTENT"):
+    engine.watch_content(os.environ["HEALTH_ASSISTANT_CONTENT"])
+if os.environ.get("HEALTH_ASSISTANT_QUERY_LOG"):
+    engine.enable_query_log(os.environ["HEALTH_ASSISTANT_QUERY_LOG"])
+if os.environ.get("HEALTH_ASSISTANT_PROFILE_DIR"):
+    engine.enable_profiling(os.environ["HEALTH_ASSISTANT_PROFILE_DIR"])
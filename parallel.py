@@ -0,0 +1,163 @@
+# Standard imports
+import os
+import sys
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+MODES = ("auto", "thread", "process", "free-threaded")
+
+
+def gil_disabled():
+    """True on a free-threaded CPython build running with the GIL off (3.13+)."""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled is not None and not is_enabled()
+
+
+# Per-process engine for process-pool workers (set up by _init_worker)
+_worker_engine = None
+
+
+def worker_log_path(path, pid=None):
+    """Per-process query log path: logs/queries.jsonl -> logs/queries.worker-<pid>.jsonl."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.worker-{pid or os.getpid()}{ext}"
+
+
+def _observer_settings(engine):
+    """The engine's query log and profiler settings, to re-create in each worker process."""
+    settings = {}
+    logger = engine.query_logger
+    if logger is not None:
+        settings["query_log"] = (logger.path, {
+            "buffer_size": logger.buffer_size, "max_bytes": logger.max_bytes, "max_age": logger.max_age,
+            "backups": logger.backups, "flush_interval": logger.flush_interval, "compress": logger.compress})
+    profiler = engine.profiler
+    if profiler is not None:
+        settings["profiling"] = (profiler.directory, {
+            "sample_rate": profiler.sample_rate, "slow_ms": profiler.slow_ms, "max_files": profiler.max_files,
+            "max_bytes": profiler.max_bytes, "trace_allocations": profiler.trace_allocations,
+            "top_allocations": profiler.top_allocations})
+    return settings
+
+
+def _watch_settings(engine):
+    """(path, interval) of the content file the engine hot-reloads, or None."""
+    watcher = engine._watcher
+    return (watcher.path, watcher.interval) if watcher is not None else None
+
+
+def _init_worker(content_path, watch, observers):
+    global _worker_engine
+    from medical_engine import engine
+    if watch:
+        # Each worker polls the parent's content file itself, so edits reach every process
+        engine.watch_content(*watch)
+    if content_path:
+        engine.reload_content(content_path)
+
+    # A forked worker inherits the parent's logger and profiler but not their
+    # background threads, so records would pile up unwritten; a spawned one
+    # re-creates them from the environment on the parent's own log path.
+    # Replace both with per-process instances configured like the parent's.
+    engine.disable_query_log()
+    engine.disable_profiling()
+    if "query_log" in observers:
+        path, options = observers["query_log"]
+        engine.enable_query_log(worker_log_path(path), **options)
+    if "profiling" in observers:
+        # Dump names include the pid, so workers can share the directory
+        directory, options = observers["profiling"]
+        engine.enable_profiling(directory, **options)
+    if observers:
+        # Pool workers leave via os._exit, which skips atexit; flush on the way out instead
+        Finalize(engine, _close_observers, args=(engine,), exitpriority=10)
+    _worker_engine = engine
+
+
+def _close_observers(engine):
+    engine.disable_query_log()
+    engine.disable_profiling()
+
+
+def _answer_in_worker(query, lang, fmt):
+    return _worker_engine.answer(query, lang).render(fmt)
+
+
+def _answer_many_in_worker(batch, lang, fmt):
+    return [_worker_engine.answer(q, lang).render(fmt) for q in batch]
+
+
+class QueryExecutor:
+    """Runs engine queries concurrently behind one submit()/map() API.
+
+    Modes:
+      - "thread": a thread pool sharing the engine's immutable snapshot. Cheap
+        to start, but CPU-bound matching serialises on the GIL.
+      - "process": one engine per worker process; scales across cores on any
+        CPython, at the cost of pickling queries and rendered results.
+      - "free-threaded": a thread pool that requires a GIL-less CPython build,
+        giving process-level scaling with shared memory.
+      - "auto": "free-threaded" when the GIL is off, otherwise "process".
+
+    Results are rendered strings in the requested format ("markdown", "html",
+    "text" or "json"). In process mode each worker re-creates the engine's
+    query log (as worker_log_path(path)) and profiler for itself, and watches
+    the same content file if the engine hot-reloads one (watch_content);
+    content_path on its own is loaded once, as in thread mode.
+    """
+
+    def __init__(self, mode="auto", workers=None, engine=None, content_path=None):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if mode == "auto":
+            mode = "free-threaded" if gil_disabled() else "process"
+        if mode == "free-threaded" and not gil_disabled():
+            raise RuntimeError("free-threaded mode needs a CPython build running with the GIL disabled")
+
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        if mode == "process":
+            if engine is None:
+                from medical_engine import engine
+            self.engine = None
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(content_path, _watch_settings(engine),
+                                                       _observer_settings(engine)))
+        else:
+            if engine is None:
+                from medical_engine import engine
+            if content_path:
+                engine.reload_content(content_path)
+            self.engine = engine
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="engine")
+
+    def submit(self, query, lang=None, fmt="markdown"):
+        """Schedule one query; returns a Future of the rendered response."""
+        if self.mode == "process":
+            return self._pool.submit(_answer_in_worker, query, lang, fmt)
+        return self._pool.submit(self._answer, query, lang, fmt)
+
+    def map(self, queries, lang=None, fmt="markdown", chunksize=64):
+        """Answer many queries, yielding rendered responses in input order."""
+        if self.mode == "process":
+            # Batch queries so pickling/IPC cost is paid per chunk, not per query
+            queries = list(queries)
+            batches = [queries[i:i + chunksize] for i in range(0, len(queries), chunksize)]
+            for results in self._pool.map(_answer_many_in_worker, batches,
+                                          [lang] * len(batches), [fmt] * len(batches)):
+                yield from results
+        else:
+            yield from self._pool.map(self._answer, queries, repeat(lang), repeat(fmt))
+
+    def _answer(self, query, lang, fmt):
+        return self.engine.answer(query, lang).render(fmt)
+
+    def close(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
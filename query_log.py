@@ -0,0 +1,159 @@
+# Standard imports
+import atexit
+import datetime
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+
+
+class QueryLogger:
+    """Buffered, non-blocking JSONL query log with size/time rotation.
+
+    `log()` only appends a dict to an in-memory ring buffer; a background
+    writer thread serialises, writes and rotates. When the buffer is full
+    the oldest unwritten records are overwritten (and counted in
+    `dropped`) so the request path never waits on disk I/O.
+    """
+
+    def __init__(self, path, buffer_size=10000, max_bytes=50 * 1024 * 1024, max_age=24 * 3600,
+                 backups=14, flush_interval=0.5, compress=True):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.compress = compress
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = False
+
+        # deque(maxlen) gives us an atomic append that discards the oldest entry when full
+        self._buffer = deque(maxlen=buffer_size)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._file = None
+        self._opened_at = 0.0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, record):
+        """Queue a record for writing. Never blocks and never raises."""
+        if self._stopped.is_set() or self.failed:
+            self.dropped += 1
+            return
+        if len(self._buffer) >= self.buffer_size:
+            self.dropped += 1
+        self._buffer.append(record)
+        # Nudge the writer early when the buffer is getting full
+        if len(self._buffer) >= self.buffer_size // 2:
+            self._wakeup.set()
+
+    def close(self):
+        """Flush everything still buffered and stop the writer thread."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+
+    def stats(self):
+        return {"buffered": len(self._buffer), "written": self.written, "dropped": self.dropped,
+                "failed": self.failed}
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except OSError as e:
+                # Disk full / permissions: stop logging rather than affect queries
+                self.failed = True
+                print(f"query_log: disabled after write error: {e}", file=sys.stderr)
+                self._buffer.clear()
+                break
+            if self._stopped.is_set() and not self._buffer:
+                break
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _drain(self):
+        if not self._buffer:
+            if self._file is not None and self._due_for_rotation():
+                self._rotate()
+            return
+
+        lines = []
+        while self._buffer:
+            try:
+                record = self._buffer.popleft()
+            except IndexError:
+                break
+            lines.append(json.dumps(record, ensure_ascii=False, default=str))
+        if not lines:
+            return
+
+        if self._file is None:
+            self._open()
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += len(lines)
+
+        if self._due_for_rotation():
+            self._rotate()
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = self._started_at()
+
+    def _started_at(self):
+        """When the current file was started, so restarts don't reset its age."""
+        try:
+            if os.path.getsize(self.path) == 0:
+                return time.time()
+        except OSError:
+            return time.time()
+        try:
+            # Engine records carry "ts"; the first one dates the file
+            with open(self.path, encoding="utf-8") as f:
+                return float(json.loads(f.readline())["ts"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return os.path.getmtime(self.path)
+
+    def _due_for_rotation(self):
+        if self._file.tell() >= self.max_bytes:
+            return True
+        return self.max_age is not None and time.time() - self._opened_at >= self.max_age
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = f"{self.path}.{stamp}"
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+
+        # Keep only the newest `backups` rotated files
+        old = sorted(glob.glob(glob.escape(self.path) + ".*"))
+        for stale in old[:-self.backups] if self.backups else old:
+            os.remove(stale)
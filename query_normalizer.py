@@ -0,0 +1,96 @@
+# Standard imports
+import re
+import unicodedata
+from functools import lru_cache
+
+# Romanised Hindi is spelled many ways; map common variants onto one form
+HINGLISH_VARIANTS = {
+    # No single letters ("vitamin h" is not "hai")
+    "hain": "hai", "haii": "hai",
+    "kyaa": "kya", "kia": "kya",
+    "nhi": "nahi", "nahin": "nahi", "nai": "nahi", "nahee": "nahi",
+    # "mai" is usually "main" (I), not "mein" (in): only a language signal, never rewritten
+    "mei": "mein",
+    "rha": "raha", "rhi": "rahi", "rhe": "rahe",
+    "kr": "kar", "krna": "karna", "krne": "karne",
+    "btaye": "bataye", "bataiye": "bataye", "btao": "batao",
+    "chahie": "chahiye", "chaiye": "chahiye",
+    "hoon": "hu", "hun": "hu",
+    "dawaim": "dawai", "dawae": "dawai", "dawa": "dawai", "dwai": "dawai",
+    "doktor": "doctor", "dr": "doctor",
+    "plz": "please", "pls": "please",
+    "cant": "can't",
+}
+
+# Hindi spelled with chandrabindu/anusvara or with/without nukta should compare equal
+_DEVANAGARI_FOLD = str.maketrans({"ँ": "ं", "़": None, "‌": None, "‍": None})
+# Dandas, typographic quotes and anything else that is not part of a word
+_PUNCT = re.compile(r"[।॥]|[^\wऀ-ॣ०-ॿ'\s]")
+_WORD = r"[\wऀ-ॣ०-ॿ]"
+_TOKEN = re.compile(_WORD + r"+(?:'" + _WORD + r"+)?")
+
+
+def _fold_digits(text):
+    # Devanagari (and other) digits -> ASCII so "१०२" and "102" match
+    return "".join(str(unicodedata.digit(ch)) if ch.isdigit() and not ch.isascii() else ch for ch in text)
+
+
+class NormalizedQuery:
+    """A query after NFKC, case folding, punctuation removal and tokenisation."""
+    __slots__ = ("original", "text", "tokens", "token_set", "has_devanagari")
+
+    def __init__(self, original, tokens, has_devanagari):
+        self.original = original
+        self.tokens = tokens
+        self.token_set = frozenset(tokens)
+        self.text = " ".join(tokens)
+        self.has_devanagari = has_devanagari
+
+    def has_any(self, words):
+        """True if any of `words` (already normalised) is a whole token."""
+        return not self.token_set.isdisjoint(words)
+
+
+def _clean(text):
+    text = unicodedata.normalize("NFKC", text).replace("’", "'").replace("‘", "'")
+    has_devanagari = any("ऀ" <= ch <= "ॿ" for ch in text)
+    if has_devanagari:
+        text = text.translate(_DEVANAGARI_FOLD)
+    return _fold_digits(_PUNCT.sub(" ", text.casefold())), has_devanagari
+
+
+@lru_cache(maxsize=8192)
+def normalize(query):
+    """Normalise a query once; repeated inputs are served from the cache."""
+    text, has_devanagari = _clean(query)
+    tokens = tuple(HINGLISH_VARIANTS.get(tok, tok) for tok in _TOKEN.findall(text))
+    return NormalizedQuery(query, tokens, has_devanagari)
+
+
+def normalize_prefix(text):
+    """Normalise partially typed input for prefix lookups.
+
+    Same folding as normalize() but without spelling-variant mapping, which
+    would rewrite a half-typed word (a lone "h" is not "hai" yet).
+    """
+    return " ".join(_TOKEN.findall(_clean(text)[0]))
+
+
+def normalize_phrase(phrase):
+    return normalize(phrase).text
+
+
+def phrase_pattern(phrase, prefix=False):
+    """Regex matching a normalised phrase at the start of a word.
+
+    The last word may carry any ending, so a topic also matches its
+    inflections ("coughing", "feverish", "fatigued", "blood tests"), while
+    word-start anchoring still keeps "hi" out of "this". By default a
+    plural "s" on the phrase itself is dropped first, so "blood tests" also
+    matches "blood test". With prefix=True the phrase is used as written -
+    for emergency keywords, where it is the shortest form to catch.
+    """
+    text = normalize_phrase(phrase)
+    if not prefix and text.endswith("s") and not text.endswith("ss"):
+        text = text[:-1]
+    return re.compile(r"(?<!" + _WORD + r"|')" + re.escape(text))
@@ -0,0 +1,226 @@
+"""Opt-in sampling profiler for slow engine queries.
+
+Enable with engine.enable_profiling(directory) (or the
+HEALTH_ASSISTANT_PROFILE_DIR environment variable). A sampled fraction of
+queries is profiled inline; any other query slower than the threshold is
+replayed (with response caches bypassed) under the profiler on a
+background thread, so the user never waits on it. Each capture writes a
+cProfile dump and a JSON summary with the top tracemalloc allocation
+sites to a directory capped by file count and size.
+
+Aggregate the captures into a ranked report:
+
+    python query_profiler.py report profiles/ --top 25
+"""
+# Standard imports
+import argparse
+import atexit
+import cProfile
+import glob
+import io
+import json
+import os
+import pstats
+import queue
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+# Keep the profiler's own bookkeeping out of the allocation report
+_OWN_FRAMES = (tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__))
+
+
+class QueryProfiler:
+    """Decides which queries to profile and writes bounded on-disk dumps."""
+
+    def __init__(self, directory, sample_rate=0.01, slow_ms=250.0, max_files=200, max_bytes=100 * 1024 * 1024,
+                 trace_allocations=True, top_allocations=25):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.trace_allocations = trace_allocations
+        self.top_allocations = top_allocations
+        self.captured = 0
+        self.skipped = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._seq = 0
+        self._write_lock = threading.Lock()
+        # Only one profile at a time: cProfile and tracemalloc don't nest
+        self._profile_lock = threading.Lock()
+        self._replays = queue.Queue(maxsize=32)
+        self._thread = threading.Thread(target=self._replay_loop, name="query-profiler", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def call(self, engine, query, lang=None):
+        """Run engine._route for one query, profiling it if sampled."""
+        if self.sample_rate and random.random() < self.sample_rate and self._profile_lock.acquire(blocking=False):
+            try:
+                return self._profile(engine, query, lang, reason="sampled")
+            finally:
+                self._profile_lock.release()
+
+        start = time.perf_counter()
+        response = engine._route(query, lang)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if latency_ms >= self.slow_ms:
+            try:
+                self._replays.put_nowait((engine, query, lang, latency_ms))
+            except queue.Full:
+                self.skipped += 1
+        return response
+
+    def close(self):
+        """Finish pending slow-query replays and stop the background thread."""
+        if self._thread.is_alive():
+            self._replays.put((None, None, None, None))
+            self._thread.join(timeout=10)
+
+    def _replay_loop(self):
+        while True:
+            engine, query, lang, latency_ms = self._replays.get()
+            if engine is None:
+                break
+            with self._profile_lock:
+                try:
+                    self._profile(engine, query, lang, reason="slow", observed_ms=latency_ms, use_cache=False)
+                except Exception as e:
+                    print(f"query_profiler: replay failed: {e}", file=sys.stderr)
+
+    def _profile(self, engine, query, lang, reason, observed_ms=None, use_cache=True):
+        tracing = self.trace_allocations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = engine._route(query, lang, use_cache=use_cache)
+        finally:
+            profiler.disable()
+            latency_ms = (time.perf_counter() - start) * 1000
+            allocations = []
+            if tracing:
+                after = tracemalloc.take_snapshot().filter_traces(_OWN_FRAMES)
+                tracemalloc.stop()
+                for stat in after.compare_to(before.filter_traces(_OWN_FRAMES), "lineno")[:self.top_allocations]:
+                    if stat.size_diff > 0:
+                        frame = stat.traceback[0]
+                        allocations.append({"site": f"{frame.filename}:{frame.lineno}",
+                                            "size": stat.size_diff, "count": stat.count_diff})
+
+        self._write(profiler, {
+            "ts": time.time(),
+            "reason": reason,
+            "query": query,
+            "lang": response.lang,
+            "branch": response.kind,
+            "latency_ms": round(latency_ms, 3),
+            "observed_ms": round(observed_ms, 3) if observed_ms is not None else None,
+            "allocations": allocations
+        })
+        return response
+
+    def _write(self, profiler, meta):
+        with self._write_lock:
+            self._seq += 1
+            base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._seq:06d}")
+            profiler.dump_stats(base + ".prof")
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            self.captured += 1
+            self._enforce_limits()
+
+    def _enforce_limits(self):
+        # Oldest captures go first; .prof and .json of one capture share a prefix.
+        # Other worker processes may be pruning the same directory concurrently.
+        captures = sorted(glob.glob(os.path.join(self.directory, "*.prof")))
+        sizes = {}
+        for prof in captures:
+            base = prof[:-5]
+            sizes[base] = sum(_size(p) for p in (prof, base + ".json"))
+        total = sum(sizes.values())
+        for prof in captures:
+            if len(sizes) <= self.max_files and total <= self.max_bytes:
+                break
+            base = prof[:-5]
+            for path in (prof, base + ".json"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= sizes.pop(base)
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def build_report(directory, top=25, sort="tottime"):
+    """Aggregate every capture in `directory` into a text report."""
+    profs = sorted(glob.glob(os.path.join(directory, "*.prof")))
+    if not profs:
+        return f"No profiles found in {directory}"
+
+    metas = []
+    for prof in profs:
+        try:
+            with open(prof[:-5] + ".json", encoding="utf-8") as f:
+                metas.append(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    out = io.StringIO()
+    reasons = {}
+    for meta in metas:
+        reasons[meta["reason"]] = reasons.get(meta["reason"], 0) + 1
+    out.write(f"{len(profs)} captures ({', '.join(f'{n} {r}' for r, n in sorted(reasons.items()))})\n\n")
+
+    def observed(meta):
+        # Slow queries were replayed; rank them by the latency the user actually saw
+        return meta["latency_ms"] if meta.get("observed_ms") is None else meta["observed_ms"]
+
+    out.write("Slowest queries\n")
+    for meta in sorted(metas, key=observed, reverse=True)[:10]:
+        ms = observed(meta)
+        out.write(f"  {ms:10.2f} ms  [{meta['branch']}/{meta['lang']}] {meta['query'][:70]!r}\n")
+
+    out.write(f"\nHot functions (by {sort})\n")
+    stats = pstats.Stats(*profs, stream=out)
+    stats.files = []  # one header line per dump file is noise here
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+    sites = {}
+    for meta in metas:
+        for alloc in meta.get("allocations", []):
+            size, count = sites.get(alloc["site"], (0, 0))
+            sites[alloc["site"]] = (size + alloc["size"], count + alloc["count"])
+    if sites:
+        out.write("Allocation sites (bytes retained during profiled queries)\n")
+        for site, (size, count) in sorted(sites.items(), key=lambda kv: -kv[1][0])[:top]:
+            out.write(f"  {size / 1024:10.1f} KiB  {count:8} blocks  {site}\n")
+    return out.getvalue()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Aggregate query profiler dumps.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="print a ranked hot-function and allocation report")
+    report.add_argument("directory")
+    report.add_argument("--top", type=int, default=25)
+    report.add_argument("--sort", default="tottime", choices=["tottime", "cumulative", "ncalls"])
+    args = ap.parse_args(argv)
+    print(build_report(args.directory, args.top, args.sort))
+
+
+if __name__ == "__main__":
+    main()
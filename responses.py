@@ -0,0 +1,200 @@
+# Standard imports
+import html
+import json
+import re
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+
+
+def _plain(text):
+    """Strip inline markdown emphasis for plain-text and JSON output."""
+    return _ITALIC.sub(r"\1", _BOLD.sub(r"\1", text))
+
+
+def _inline_html(text):
+    text = html.escape(text)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _ITALIC.sub(r"<em>\1</em>", text)
+
+
+class Section:
+    """One block of a response: an optional heading, intro, list or table.
+
+    `style` is "heading" (### title) or "label" (**title** on its own line).
+    Renders are cached per format, so a Section shared between cached
+    responses is only ever rendered once per format.
+    """
+    __slots__ = ("key", "title", "icon", "intro", "items", "ordered", "callout", "table", "style", "rule", "_cache")
+
+    def __init__(self, key, title=None, icon=None, intro=None, items=(), ordered=False, callout=None,
+                 table=None, style="heading", rule=False):
+        self.key = key
+        self.title = title
+        self.icon = icon
+        self.intro = intro
+        self.items = tuple(items)
+        self.ordered = ordered
+        self.callout = callout
+        self.table = table
+        self.style = style
+        self.rule = rule
+        self._cache = {}
+
+    def render(self, fmt):
+        cached = self._cache.get(fmt)
+        if cached is None:
+            cached = self._cache[fmt] = getattr(self, "_render_" + fmt)()
+        return cached
+
+    def _render_markdown(self):
+        out = "---\n" if self.rule else ""
+        if self.title:
+            if self.style == "label":
+                out += f"**{self.title}**\n"
+            else:
+                out += f"### {self.icon + ' ' if self.icon else ''}{self.title}\n"
+        if self.callout:
+            out += f"> [!CAUTION]\n> {self.callout}\n\n"
+        if self.intro:
+            out += f"{self.intro}\n"
+        for n, item in enumerate(self.items, 1):
+            out += f"{n}. {item}\n" if self.ordered else f"- {item}\n"
+        if self.table:
+            header, rows = self.table
+            out += "| " + " | ".join(header) + " |\n"
+            out += "|" + "---|" * len(header) + "\n"
+            for row in rows:
+                out += "| " + " | ".join(row) + " |\n"
+        return out + "\n"
+
+    def _render_text(self):
+        lines = []
+        if self.title:
+            if self.style == "label":
+                lines.append(_plain(self.title) if self.title.endswith(":") else f"{_plain(self.title)}:")
+            else:
+                lines.append(_plain(self.title).upper())
+        if self.callout:
+            lines.append(f"CAUTION: {_plain(self.callout)}")
+        if self.intro:
+            lines.append(_plain(self.intro))
+        for n, item in enumerate(self.items, 1):
+            lines.append(f"{n}. {_plain(item)}" if self.ordered else f"- {_plain(item)}")
+        if self.table:
+            header, rows = self.table
+            for row in rows:
+                lines.append(", ".join(f"{h}: {_plain(v)}" for h, v in zip(header, row)))
+        return "\n".join(lines) + "\n\n"
+
+    def _render_html(self):
+        out = "<hr>" if self.rule else ""
+        out += f'<section class="{html.escape(self.key)}">'
+        if self.title:
+            title = _inline_html(self.title)
+            if self.style == "label":
+                out += f"<p><strong>{title}</strong></p>"
+            else:
+                out += f"<h3>{html.escape(self.icon) + ' ' if self.icon else ''}{title}</h3>"
+        if self.callout:
+            out += f'<blockquote class="caution">{_inline_html(self.callout)}</blockquote>'
+        if self.intro:
+            out += "<p>" + _inline_html(self.intro).replace("\n", "<br>") + "</p>"
+        if self.items:
+            tag = "ol" if self.ordered else "ul"
+            out += f"<{tag}>" + "".join(f"<li>{_inline_html(i)}</li>" for i in self.items) + f"</{tag}>"
+        if self.table:
+            header, rows = self.table
+            out += "<table><tr>" + "".join(f"<th>{html.escape(h)}</th>" for h in header) + "</tr>"
+            for row in rows:
+                out += "<tr>" + "".join(f"<td>{_inline_html(v)}</td>" for v in row) + "</tr>"
+            out += "</table>"
+        return out + "</section>"
+
+    def to_dict(self):
+        data = {"key": self.key}
+        if self.title:
+            data["title"] = _plain(self.title)
+        if self.callout:
+            data["callout"] = _plain(self.callout)
+        if self.intro:
+            data["intro"] = _plain(self.intro)
+        if self.items:
+            data["items"] = [_plain(i) for i in self.items]
+            data["ordered"] = self.ordered
+        if self.table:
+            header, rows = self.table
+            data["table"] = [dict(zip(header, (_plain(v) for v in row))) for row in rows]
+        return data
+
+
+class Response:
+    """A structured engine answer that renders to markdown, HTML, text or JSON on demand."""
+    __slots__ = ("kind", "lang", "severity", "topics", "title", "sections", "footer", "footer_rule", "_cache")
+
+    def __init__(self, kind, lang, sections, title=None, footer=None, footer_rule=True, severity="info", topics=()):
+        self.kind = kind
+        self.lang = lang
+        self.severity = severity
+        self.topics = tuple(topics)
+        self.title = title
+        self.sections = tuple(sections)
+        self.footer = footer
+        self.footer_rule = footer_rule
+        self._cache = {}
+
+    def render(self, fmt="markdown"):
+        cached = self._cache.get(fmt)
+        if cached is None:
+            cached = self._cache[fmt] = getattr(self, "_render_" + fmt)()
+        return cached
+
+    def to_markdown(self):
+        return self.render("markdown")
+
+    def to_html(self):
+        return self.render("html")
+
+    def to_text(self):
+        return self.render("text")
+
+    def to_json(self):
+        return self.render("json")
+
+    def __str__(self):
+        return self.to_markdown()
+
+    def _render_markdown(self):
+        out = f"## {self.title}\n\n" if self.title else ""
+        out += "".join(s.render("markdown") for s in self.sections)
+        if self.footer:
+            out = out.rstrip("\n") + ("\n\n---\n" if self.footer_rule else "\n\n") + self.footer
+        return out.rstrip("\n")
+
+    def _render_text(self):
+        out = f"{_plain(self.title).upper()}\n\n" if self.title else ""
+        out += "".join(s.render("text") for s in self.sections)
+        if self.footer:
+            out += _plain(self.footer)
+        return out.rstrip("\n")
+
+    def _render_html(self):
+        out = f'<article class="response {html.escape(self.kind)} {html.escape(self.severity)}">'
+        if self.title:
+            out += f"<h2>{_inline_html(self.title)}</h2>"
+        out += "".join(s.render("html") for s in self.sections)
+        if self.footer:
+            out += ("<hr>" if self.footer_rule else "") + f'<p class="disclaimer">{_inline_html(self.footer)}</p>'
+        return out + "</article>"
+
+    def _render_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def to_dict(self):
+        data = {"kind": self.kind, "lang": self.lang, "severity": self.severity, "topics": list(self.topics)}
+        if self.title:
+            data["title"] = _plain(self.title)
+        data["sections"] = [s.to_dict() for s in self.sections]
+        if self.footer:
+            data["footer"] = _plain(self.footer)
+        return data
@@ -6,6 +6,7 @@ import os
 # Diagnostic wrapper to catch early startup errors
 try:
     from medical_engine import engine
+    from health_metrics import DEFAULT_WATER_GOAL_ML, bmi_category, calculate_bmi, hydration_percent
 except Exception as e:
     st.error(f"❌ Critical Error: Could not load Medical Engine.")
     st.code(traceback.format_exc())
@@ -100,7 +101,30 @@ with tab_chat:
     # Display Chat History
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+            if message.get("severity") == "emergency":
+                st.error(message["content"])
+            else:
+                st.markdown(message["content"])
+
+    # Typeahead: suggest covered topics and lab markers while the user types
+    prefix = st.text_input("🔎 Not sure what to ask? Start typing a symptom", key="topic_search",
+                           placeholder="e.g. bukh, सिर, sugar, platelets")
+    if prefix:
+        suggestions = engine.suggest(prefix, k=5)
+        if suggestions:
+            cols = st.columns(len(suggestions))
+            for col, s in zip(cols, suggestions):
+                label = s.text if s.text == s.target else f"{s.text} → {s.target}"
+                if col.button(label, key=f"suggest_{s.kind}_{s.target}"):
+                    if s.kind == "topic":
+                        st.session_state.quick_query = s.target.capitalize()
+                        st.session_state.quick_lang = s.lang
+                    else:
+                        ref = engine.lab_markers[s.target]
+                        st.info(f"Paste your result into the chat, e.g. **{s.target} {ref['min']} {ref['unit']}**. "
+                                f"Reference range: {ref['min']}–{ref['max']} {ref['unit']}.")
+        else:
+            st.caption("No matching topics yet. Try another spelling, or ask in your own words below.")
 
     # Chat Input
     query = st.chat_input("💬 Ask me something about your health...")
@@ -117,11 +141,15 @@ with tab_chat:
 
         with st.spinner("🤖 Consulting medical knowledge base..."):
             try:
-                # Automatically detect and use language
-                bot_response = engine.process_query(query)
-                st.session_state.messages.append({"role": "assistant", "content": bot_response})
+                # Detect the language automatically unless a suggestion set it
+                response = engine.answer(query, st.session_state.pop("quick_lang", None))
+                bot_response = response.to_markdown()
+                st.session_state.messages.append({"role": "assistant", "content": bot_response, "severity": response.severity})
                 with st.chat_message("assistant"):
-                    st.markdown(bot_response)
+                    if response.severity == "emergency":
+                        st.error(bot_response)
+                    else:
+                        st.markdown(bot_response)
             except Exception as e:
                 st.error(f"⚠️ I encountered an error: {e}")
 
@@ -129,7 +157,7 @@ with tab_chat:
 
 
 if "water_goal" not in st.session_state:
-    st.session_state.water_goal = 2500  # ml
+    st.session_state.water_goal = DEFAULT_WATER_GOAL_ML
 if "water_intake" not in st.session_state:
     st.session_state.water_intake = 0
 if "water_intake" not in st.session_state:
@@ -145,24 +173,22 @@ with tab_tools:
             weight = st.number_input("Weight (kg)", min_value=1.0, max_value=300.0, value=70.0)
             height = st.number_input("Height (cm)", min_value=50.0, max_value=250.0, value=170.0)
             if st.button("Calculate BMI"):
-                bmi = weight / ((height/100)**2)
+                bmi = calculate_bmi(weight, height)
                 st.session_state.last_bmi = bmi
         
         if "last_bmi" in st.session_state:
             bmi = st.session_state.last_bmi
             st.metric("Your BMI", f"{bmi:.1f}")
-            if bmi < 18.5: st.warning("Status: Underweight. You may need a more nutrient-dense diet.")
-            elif 18.5 <= bmi < 25: st.success("Status: Healthy Weight. Keep it up!")
-            elif 25 <= bmi < 30: st.warning("Status: Overweight. Consider checking your daily activity levels.")
-            else: st.error("Status: Obese. It's recommended to consult a healthcare provider for a plan.")
+            category = bmi_category(bmi)
+            getattr(st, category["level"])(category["message"])
 
     elif tool_choice == "Water Tracker":
         st.subheader("💧 Daily Water Tracker")
-        goal = st.number_input("Goal (ml)", min_value=1000, max_value=10000, value=st.session_state.get("water_goal", 2500))
+        goal = st.number_input("Goal (ml)", min_value=1000, max_value=10000, value=st.session_state.get("water_goal", DEFAULT_WATER_GOAL_ML))
         st.session_state.water_goal = goal
         
-        progress = st.session_state.water_intake / st.session_state.water_goal
-        st.progress(min(progress, 1.0))
+        progress = hydration_percent(st.session_state.water_intake, st.session_state.water_goal)
+        st.progress(min(progress / 100, 1.0))
         st.write(f"Intake: **{st.session_state.water_intake} ml** / {st.session_state.water_goal} ml")
         
         cols = st.columns(3)
@@ -207,6 +233,22 @@ with tab_tools:
                     st.session_state.med_checklist.pop(i)
                     st.rerun()
             
+            # Interaction & duplicate-ingredient check
+            check = engine.check_medications([med["name"] for med in st.session_state.med_checklist])
+            for dup in check.duplicates:
+                st.warning(f"⚠️ Duplicate ingredient: **{dup.ingredient.capitalize()}** is in {', '.join(dup.entries)}. Check your total daily dose.")
+            for inter in check.interactions:
+                alert = st.error if inter.severity == "major" else st.warning
+                alert(f"💊 {inter.first.capitalize()} + {inter.second.capitalize()} ({inter.severity}): {inter.note}")
+            for dup in check.class_duplicates:
+                st.warning(f"💊 {', '.join(i.capitalize() for i in dup.ingredients)} are all {dup.cls}s; "
+                           f"taking more than one adds side effects without extra benefit.")
+            if check.duplicates or check.interactions or check.class_duplicates:
+                st.caption("Always confirm combinations with your pharmacist or doctor.")
+            if check.unresolved:
+                st.caption(f"Not recognised, so not checked: {', '.join(check.unresolved)}. "
+                           "Ask your pharmacist about these.")
+
             if st.button("🔄 Reset All for New Day"):
                 for med in st.session_state.med_checklist:
                     med["taken"] = False
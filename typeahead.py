@@ -0,0 +1,160 @@
+"""Typeahead suggestions for topics, their aliases and lab markers.
+
+Every name a user might type (English topic names, Hindi and Hinglish
+aliases, lab marker abbreviations) is normalised and inserted into a
+character trie, once from the start of the name and once from each later
+word ("pain" finds "abdominal pain"). Each trie node stores its
+best-ranked entries, so a lookup is a walk of len(prefix) steps with no
+scan or sort, whatever the size of the knowledge base.
+
+Ranking is by popularity (e.g. topic counts from the query log, see
+popularity_from_log), with a topic's own name ahead of its aliases, then
+by shorter name.
+"""
+# Standard imports
+import gzip
+import json
+from collections import Counter, namedtuple
+
+from lab_parser import MARKER_ALIASES
+from query_normalizer import normalize_prefix
+
+Suggestion = namedtuple("Suggestion", ["text", "kind", "target", "lang", "score"])
+
+# Names people use for each built-in topic besides the English key. Content
+# files can add more per topic with an "aliases" field of the same shape.
+TOPIC_ALIASES = {
+    "headache": {"en": ["head pain"], "hinglish": ["sir dard", "sar dard", "sirdard"], "hi": ["सिरदर्द", "सिर दर्द"]},
+    "fever": {"en": ["temperature"], "hinglish": ["bukhar", "bukhaar", "taap"], "hi": ["बुखार", "ज्वर"]},
+    "abdominal pain": {"en": ["stomach ache", "stomach pain", "tummy ache"], "hinglish": ["pet dard", "pet mein dard"],
+                       "hi": ["पेट दर्द", "पेट में दर्द"]},
+    "cough": {"hinglish": ["khansi", "khaansi"], "hi": ["खांसी"]},
+    "diabetes": {"en": ["sugar", "blood sugar"], "hinglish": ["sugar ki bimari", "madhumeh"], "hi": ["मधुमेह", "शुगर"]},
+    "hypertension": {"en": ["high blood pressure", "blood pressure", "high bp"], "hinglish": ["bp ki bimari"],
+                     "hi": ["उच्च रक्तचाप", "हाई बीपी"]},
+    "fatigue": {"en": ["tiredness", "weakness"], "hinglish": ["thakan", "thakaan", "kamzori"], "hi": ["थकान", "कमजोरी"]},
+    "anemia": {"en": ["anaemia", "low hemoglobin"], "hinglish": ["khoon ki kami"], "hi": ["खून की कमी", "एनीमिया"]},
+    "blood loss": {"en": ["bleeding"], "hinglish": ["khoon behna"], "hi": ["खून बहना", "रक्तस्राव"]},
+    "blood tests": {"en": ["blood test", "lab test", "lab report"], "hinglish": ["khoon ki jaanch", "khoon ki janch"],
+                    "hi": ["खून की जांच", "ब्लड टेस्ट"]},
+}
+
+# Lab marker names beyond the English aliases the lab parser recognises
+LAB_MARKER_ALIASES = {
+    "hemoglobin": {"hi": ["हीमोग्लोबिन"]},
+    "glucose": {"hinglish": ["sugar level"], "hi": ["ग्लूकोज", "शुगर लेवल"]},
+    "wbc": {"hi": ["श्वेत रक्त कोशिका"]},
+    "platelets": {"hi": ["प्लेटलेट्स"]},
+}
+
+# The topic/marker name itself ranks above its aliases, and a match on a
+# later word below one on the start of the name
+_ALIAS_WEIGHT = 0.8
+_INNER_WORD_WEIGHT = 0.5
+
+
+class TypeaheadIndex:
+    """Prefix trie over topic and lab marker names with precomputed top-k per node."""
+
+    def __init__(self, entries, popularity=None, max_k=10):
+        """`entries` are (text, kind, target, lang) tuples; `popularity` maps target -> count."""
+        popularity = popularity or {}
+        self.max_k = max_k
+        self.size = 0
+        # A node is [children, ranked entries]; children maps one character to a node
+        self._root = [{}, []]
+
+        insertions = []
+        for text, kind, target, lang in entries:
+            key = normalize_prefix(text)
+            if not key:
+                continue
+            score = 1.0 + popularity.get(target, 0)
+            if text != target:
+                score *= _ALIAS_WEIGHT
+            insertions.append((score, key, text, kind, target, lang))
+            for i, ch in enumerate(key):
+                if ch == " ":
+                    insertions.append((score * _INNER_WORD_WEIGHT, key[i + 1:], text, kind, target, lang))
+            self.size += 1
+
+        # Insert best first, so each node keeps the first max_k targets that reach it
+        # and no node ever needs sorting
+        insertions.sort(key=lambda ins: (-ins[0], len(ins[2]), ins[2]))
+        for score, key, text, kind, target, lang in insertions:
+            self._insert(key, Suggestion(text, kind, target, lang, score))
+
+    def _insert(self, key, entry):
+        node = self._root
+        for ch in key:
+            node = node[0].setdefault(ch, [{}, []])
+            ranked = node[1]
+            # One suggestion per target, so "sir dard" and "sirdard" don't both show
+            if len(ranked) < self.max_k and not any(e.target == entry.target and e.kind == entry.kind for e in ranked):
+                ranked.append(entry)
+
+    def _lookup(self, key):
+        node = self._root
+        for ch in key:
+            node = node[0].get(ch)
+            if node is None:
+                return ()
+        return node[1]
+
+    def suggest(self, prefix, k=5):
+        """Top-k suggestions for partially typed input.
+
+        The whole input is tried first, then each trailing run of words, so
+        "mujhe bukh" still suggests fever once "mujhe bukh" itself has no match.
+        """
+        key = normalize_prefix(prefix)
+        results, seen = [], set()
+        start = 0
+        while key and start < len(key):
+            for entry in self._lookup(key[start:]):
+                if (entry.kind, entry.target) not in seen:
+                    seen.add((entry.kind, entry.target))
+                    results.append(entry)
+                    if len(results) == k:
+                        return results
+            start = key.find(" ", start) + 1
+            if start == 0:
+                break
+        return results
+
+
+def content_entries(knowledge_base, lab_markers):
+    """(text, kind, target, lang) for every topic, alias and lab marker name."""
+    for topic, data in knowledge_base.items():
+        yield topic, "topic", topic, "en"
+        for aliases in (TOPIC_ALIASES.get(topic, {}), data.get("aliases", {})):
+            for lang, names in aliases.items():
+                for name in names:
+                    yield name, "topic", topic, lang
+    for marker, ref in lab_markers.items():
+        yield marker, "lab_marker", marker, "en"
+        for name in MARKER_ALIASES.get(marker, ()):
+            yield name, "lab_marker", marker, "en"
+        for aliases in (LAB_MARKER_ALIASES.get(marker, {}), ref.get("aliases", {})):
+            for lang, names in aliases.items():
+                for name in names:
+                    yield name, "lab_marker", marker, lang
+
+
+def build_index(knowledge_base, lab_markers, popularity=None):
+    return TypeaheadIndex(content_entries(knowledge_base, lab_markers), popularity)
+
+
+def popularity_from_log(paths):
+    """Count answered topics in query log files (plain or gzip-rotated JSONL)."""
+    counts = Counter()
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                counts.update(record.get("topics", ()))
+    return counts
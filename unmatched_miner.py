@@ -0,0 +1,212 @@
+"""Find what users ask about that the engine cannot answer yet.
+
+Streams queries (plain text, one per line, or the JSONL written by the
+query log) through the engine's routing, keeps only the ones that end in
+the fallback response, and tracks the most frequent n-grams per language
+with a count-min sketch plus a top-k heap, so memory stays fixed no
+matter how many queries are read.
+
+    python unmatched_miner.py queries.txt --top 30
+    tail -f logs/queries.jsonl | python unmatched_miner.py - --report-every 10000
+"""
+# Standard imports
+import argparse
+import difflib
+import heapq
+import json
+import sys
+from array import array
+
+from query_normalizer import normalize
+
+# Words that carry no topic on their own (English + romanised Hindi)
+STOPWORDS = {
+    "a", "an", "the", "i", "me", "my", "is", "am", "are", "was", "be", "been", "to", "of", "in", "on",
+    "for", "and", "or", "it", "this", "that", "with", "have", "has", "had", "do", "does", "can", "could",
+    "what", "how", "why", "when", "should", "tell", "about", "from", "at", "im", "i'm", "you", "your",
+    "please", "some", "any", "get", "got", "since", "very", "so", "not", "no", "but", "will", "would",
+    "hai", "kya", "ka", "ki", "ko", "mein", "bhi", "toh", "kar", "hoga", "sakta", "nahi", "pe", "aap",
+    "hu", "tha", "thi", "rahe", "raha", "rahi", "chahiye", "karna", "ke", "ne", "liye",
+    "ho", "mujhe", "mera", "meri", "bataye", "batao", "batana", "karu", "karein", "se", "aur",
+    "है", "क्या", "का", "की", "के", "को", "में", "से", "और", "मुझे", "मेरा", "मेरी", "हूं", "हो", "रहा", "रही",
+}
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimator (over-counts, never under-counts)."""
+
+    def __init__(self, width=1 << 18, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def add(self, item, count=1):
+        """Add `count` to `item` and return its new estimated frequency."""
+        estimate = None
+        for seed, row in enumerate(self.rows):
+            i = hash((seed, item)) % self.width
+            row[i] += count
+            if estimate is None or row[i] < estimate:
+                estimate = row[i]
+        return estimate
+
+    def estimate(self, item):
+        return min(row[hash((seed, item)) % self.width] for seed, row in enumerate(self.rows))
+
+
+class TopK:
+    """Keeps the k items with the highest estimated counts using a lazy min-heap."""
+
+    def __init__(self, k):
+        self.k = k
+        self.counts = {}
+        self.heap = []
+
+    def offer(self, item, estimate):
+        if item in self.counts:
+            self.counts[item] = estimate
+            heapq.heappush(self.heap, (estimate, item))
+        elif len(self.counts) < self.k:
+            self.counts[item] = estimate
+            heapq.heappush(self.heap, (estimate, item))
+        elif estimate > self._min():
+            _, evicted = heapq.heappop(self.heap)
+            del self.counts[evicted]
+            self.counts[item] = estimate
+            heapq.heappush(self.heap, (estimate, item))
+
+        # Stale heap entries pile up on updates; rebuild once the heap is much bigger than k
+        if len(self.heap) > 4 * self.k:
+            self.heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def _min(self):
+        # Discard stale entries until the top reflects a current count
+        while self.heap[0][0] != self.counts.get(self.heap[0][1]):
+            heapq.heappop(self.heap)
+        return self.heap[0][0]
+
+    def items(self):
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+class UnmatchedMiner:
+    """Routes queries through the engine and mines n-grams from fallback answers."""
+
+    def __init__(self, engine=None, top=50, width=1 << 18, depth=4, max_n=3):
+        if engine is None:
+            from medical_engine import engine
+        self.engine = engine
+        self.top = top
+        self.width = width
+        self.depth = depth
+        self.max_n = max_n
+        self.sketches = {}
+        self.heaps = {}
+        self.seen = 0
+        self.unmatched = {}
+
+    def feed(self, query, lang=None, branch=None):
+        """Process one query; `branch`/`lang` may come from an existing query log record."""
+        query = query.strip()
+        if not query:
+            return
+        self.seen += 1
+        if branch is None:
+            response = self.engine._route(query, lang)
+            lang, branch = response.lang, response.kind
+        elif lang is None:
+            lang = self.engine.detect_language(query)
+        if branch != "fallback":
+            return
+
+        self.unmatched[lang] = self.unmatched.get(lang, 0) + 1
+        if lang not in self.sketches:
+            self.sketches[lang] = CountMinSketch(self.width, self.depth)
+            self.heaps[lang] = TopK(self.top)
+        sketch, heap = self.sketches[lang], self.heaps[lang]
+
+        # Count each n-gram once per query so one rambling message can't dominate
+        for gram in set(self._ngrams(query)):
+            heap.offer(gram, sketch.add(gram))
+
+    def feed_lines(self, lines, report_every=0, out=sys.stdout):
+        for line in lines:
+            line = line.strip()
+            if line.startswith("{"):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.feed(line)
+                else:
+                    self.feed(record.get("query", ""), record.get("lang"), record.get("branch"))
+            else:
+                self.feed(line)
+            if report_every and self.seen % report_every == 0:
+                out.write(self.report() + "\n")
+                out.flush()
+
+    def _ngrams(self, query):
+        # Same tokens the engine matched on, so variants like "rha"/"raha" count together
+        words = [w for w in normalize(query).tokens if not w.isdigit()]
+        for n in range(1, self.max_n + 1):
+            for i in range(len(words) - n + 1):
+                gram = words[i:i + n]
+                # Phrases must start and end on a content word
+                if gram[0] in STOPWORDS or gram[-1] in STOPWORDS:
+                    continue
+                yield " ".join(gram)
+
+    def candidates(self, lang):
+        """Ranked (phrase, count, kind, related_topic) suggestions for one language."""
+        topics = list(self.engine.knowledge_base)
+        ranked = self.heaps.get(lang, TopK(0)).items()
+        results = []
+        for gram, count in ranked:
+            # "back" and "pain" add nothing when "back pain" is (nearly) as frequent
+            padded = f" {gram} "
+            if any(count <= 1.1 * c and padded in f" {g} " and g != gram for g, c in ranked):
+                continue
+            # Something that looks like an existing topic is probably a missing alias
+            close = difflib.get_close_matches(gram, topics, n=1, cutoff=0.75)
+            for word in gram.split():
+                if close:
+                    break
+                close = difflib.get_close_matches(word, topics, n=1, cutoff=0.75)
+            if close:
+                results.append((gram, count, "alias", close[0]))
+            else:
+                results.append((gram, count, "topic", None))
+        return results
+
+    def report(self):
+        lines = [f"Queries seen: {self.seen}, unmatched: {sum(self.unmatched.values())}"]
+        for lang in sorted(self.heaps):
+            lines.append(f"\n[{lang}] {self.unmatched[lang]} unmatched queries")
+            for gram, count, kind, topic in self.candidates(lang):
+                hint = f"alias of '{topic}'" if kind == "alias" else "new topic"
+                lines.append(f"  {count:>10}  {gram:<40} {hint}")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Mine frequent unmatched queries to grow the knowledge base.")
+    ap.add_argument("source", help="query file (text or query-log JSONL), or '-' for stdin")
+    ap.add_argument("--top", type=int, default=50, help="phrases to keep per language")
+    ap.add_argument("--width", type=int, default=1 << 18, help="count-min sketch width")
+    ap.add_argument("--depth", type=int, default=4, help="count-min sketch depth")
+    ap.add_argument("--max-n", type=int, default=3, help="longest n-gram to track")
+    ap.add_argument("--report-every", type=int, default=0, help="print a report every N queries")
+    args = ap.parse_args(argv)
+
+    miner = UnmatchedMiner(top=args.top, width=args.width, depth=args.depth, max_n=args.max_n)
+    if args.source == "-":
+        miner.feed_lines(sys.stdin, args.report_every)
+    else:
+        with open(args.source, encoding="utf-8", errors="replace") as f:
+            miner.feed_lines(f, args.report_every)
+    print(miner.report())
+
+
+if __name__ == "__main__":
+    main()